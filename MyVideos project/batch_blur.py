@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Batch Video Text Blur
+Processes many videos concurrently across a pool of worker processes,
+each holding one warm OCR reader, with a resumable results manifest
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from blur_text_video import add_processing_arguments, build_processor, processor_options
+
+
+VIDEO_EXTENSIONS = {'.mp4', '.mov'}
+
+# One VideoTextBlur per worker process, created once by _init_worker
+_worker_processor = None
+_worker_error = None  # Why _init_worker couldn't build the processor, if it failed
+
+
+def collect_inputs(sources, manifest=None):
+    """
+    Expand directories, glob patterns and manifest files into video paths
+
+    Files that aren't MP4/MOV videos are skipped silently when they come from
+    a directory or glob pattern. Explicit paths and manifest entries that are
+    missing or aren't MP4/MOV get a warning, so a typo doesn't just shrink the batch.
+
+    Args:
+        sources: List of files, directories or glob patterns
+        manifest: Optional text file (one path per line) or JSON list of paths
+
+    Returns:
+        List of unique input Paths, in the order given
+    """
+    candidates = []  # (path, named explicitly)
+
+    for source in sources:
+        if glob.has_magic(source):
+            candidates.extend((Path(p), False) for p in sorted(glob.glob(source, recursive=True)))
+        elif Path(source).is_dir():
+            candidates.extend((path, False) for path in sorted(Path(source).iterdir()))
+        else:
+            candidates.append((Path(source), True))
+
+    if manifest:
+        manifest = Path(manifest)
+        if manifest.suffix.lower() == '.json':
+            entries = json.loads(manifest.read_text())
+        else:
+            entries = [line.strip() for line in manifest.read_text().splitlines()]
+            entries = [line for line in entries if line and not line.startswith('#')]
+        # Relative manifest entries are relative to the manifest itself
+        candidates.extend((manifest.parent / entry, True) for entry in entries)
+
+    inputs = []
+    seen = set()
+    for path, explicit in candidates:
+        if path.suffix.lower() not in VIDEO_EXTENSIONS:
+            if explicit:
+                print(f"⚠ Skipping {path}: not an MP4/MOV video", file=sys.stderr)
+            continue
+        if not path.is_file():
+            if explicit:
+                print(f"⚠ Skipping {path}: file not found", file=sys.stderr)
+            continue
+        key = path.resolve()
+        if key not in seen:
+            seen.add(key)
+            inputs.append(path)
+
+    return inputs
+
+
+def output_path_for(input_path, output_dir):
+    """Output file for an input video: <output_dir>/<stem>_blurred<ext>"""
+    input_path = Path(input_path)
+    return Path(output_dir) / f"{input_path.stem}_blurred{input_path.suffix}"
+
+
+def load_results(results_path):
+    """Load a results manifest, or an empty one if it doesn't exist yet"""
+    results_path = Path(results_path)
+    if results_path.exists():
+        return json.loads(results_path.read_text())
+    return {'created_at': datetime.utcnow().isoformat() + 'Z', 'results': {}}
+
+
+def save_results(results_path, results):
+    """Write the results manifest atomically so an interrupted batch can resume"""
+    results_path = Path(results_path)
+    results['updated_at'] = datetime.utcnow().isoformat() + 'Z'
+    temp_path = results_path.with_suffix('.tmp')
+    temp_path.write_text(json.dumps(results, indent=2))
+    os.replace(temp_path, results_path)
+
+
+def _init_worker(options):
+    """
+    Load the OCR model once per worker process
+
+    Errors are kept for _process_one to report: a Pool whose initializer
+    raises respawns workers forever and never returns results.
+    """
+    global _worker_processor, _worker_error
+    try:
+        _worker_processor = build_processor(options)
+    except Exception as e:
+        _worker_error = f"Could not initialize worker: {e}"
+
+
+def _process_one(task):
+    """Process a single video in a worker and report timing and status"""
+    input_path, output_path, process_options = task
+    record = {
+        'input': input_path,
+        'output': output_path,
+        'started_at': datetime.utcnow().isoformat() + 'Z',
+        'worker_pid': os.getpid()
+    }
+    start = time.perf_counter()
+
+    try:
+        if _worker_processor is None:
+            raise RuntimeError(_worker_error)
+        stats = _worker_processor.process_video(input_path, output_path, **process_options)
+        record['status'] = 'completed'
+        record['stats'] = stats
+    except Exception as e:
+        record['status'] = 'failed'
+        record['error'] = str(e)
+
+    record['duration_seconds'] = round(time.perf_counter() - start, 3)
+    record['completed_at'] = datetime.utcnow().isoformat() + 'Z'
+    return record
+
+
+def run_batch(inputs, output_dir, options, workers=2, results_path='batch_results.json',
+              sample_rate=1, padding=10, buffer_frames=4, partial_reencode=False,
+              target_speed=None, max_sample_gap=None, force=False):
+    """
+    Process videos concurrently, skipping outputs completed by a previous run
+
+    Args:
+        inputs: List of input video paths
+        output_dir: Directory for blurred outputs
+        options: processor_options() dict used to build each worker's VideoTextBlur
+        workers: Number of worker processes (one OCR reader each)
+        results_path: JSON manifest with per-file status and timing
+        sample_rate: Process every Nth frame for text detection
+        padding: Padding around detected text regions
+        buffer_frames: Preallocated frame buffers per worker
+        partial_reencode: Only re-encode GOPs that contain blurred frames
+        target_speed: Realtime factor each worker holds (see ThroughputGovernor)
+        max_sample_gap: Largest OCR interval the governor may use
+        force: Reprocess files even if already completed
+
+    Returns:
+        Results manifest dict
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results = load_results(results_path)
+
+    process_options = {
+        'sample_rate': sample_rate,
+        'padding': padding,
+        'buffer_frames': buffer_frames,
+        'partial_reencode': partial_reencode,
+        'target_speed': target_speed,
+        'max_sample_gap': max_sample_gap
+    }
+    tasks = []
+    outputs = {}
+    for input_path in inputs:
+        output_path = output_path_for(input_path, output_dir)
+        if output_path in outputs:
+            raise ValueError(f"Inputs {outputs[output_path]} and {input_path} "
+                             f"map to the same output {output_path}")
+        outputs[output_path] = input_path
+
+        previous = results['results'].get(str(input_path))
+        completed = previous and previous.get('status') == 'completed'
+        if not force and completed and output_path.exists():
+            print(f"Skipping (already completed): {input_path}")
+            continue
+        tasks.append((str(input_path), str(output_path), process_options))
+
+    print(f"\nBatch: {len(tasks)} to process, {len(inputs) - len(tasks)} already completed")
+    if not tasks:
+        return results
+
+    workers = max(1, min(workers, len(tasks)))
+    print(f"Starting {workers} worker process(es)...")
+
+    # Spawn keeps CUDA/OpenCV state out of the children
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers, initializer=_init_worker, initargs=(options,)) as pool:
+        for record in pool.imap_unordered(_process_one, tasks):
+            results['results'][record['input']] = record
+            save_results(results_path, results)
+
+            if record['status'] == 'completed':
+                print(f"✓ {record['input']} ({record['duration_seconds']:.1f}s)")
+            else:
+                print(f"❌ {record['input']}: {record['error']}", file=sys.stderr)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Blur specific words/text in many videos concurrently',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Every MP4/MOV in a directory, 4 workers
+  python batch_blur.py videos/ --output-dir blurred/ --words "password" --workers 4
+
+  # Glob pattern
+  python batch_blur.py "recordings/**/*.mov" --output-dir blurred/ --blur-all
+
+  # Manifest file (one path per line); rerun the same command to resume
+  python batch_blur.py --manifest todo.txt --output-dir blurred/ --words "secret" --results run1.json
+        """
+    )
+
+    parser.add_argument('sources', nargs='*', help='Input videos, directories or glob patterns')
+    parser.add_argument('--manifest', default=None,
+                        help='Text file (one path per line) or JSON list of input videos')
+    parser.add_argument('--output-dir', required=True, help='Directory for blurred videos')
+    parser.add_argument('--workers', type=int, default=2,
+                        help='Number of worker processes, each with its own OCR reader '
+                             '(default: 2)')
+    parser.add_argument('--results', default='batch_results.json',
+                        help='Results manifest with per-file timing and status '
+                             '(default: batch_results.json)')
+    parser.add_argument('--force', action='store_true',
+                        help='Reprocess files already completed in the results manifest')
+    parser.add_argument('--words', nargs='*', default=None,
+                        help='Specific words/phrases to blur (case-insensitive)')
+    parser.add_argument('--blur-all', action='store_true',
+                        help='Blur ALL detected text (ignores --words)')
+    add_processing_arguments(parser)
+
+    args = parser.parse_args()
+
+    if not args.blur_all and not args.words:
+        parser.error('batch mode is non-interactive: pass --words or --blur-all')
+    if args.partial_reencode and args.target_speed:
+        parser.error('--target-speed is not available with --partial-reencode')
+
+    try:
+        inputs = collect_inputs(args.sources, args.manifest)
+        if not inputs:
+            raise FileNotFoundError("No MP4/MOV inputs found")
+
+        target_words = None if args.blur_all else args.words
+        results = run_batch(
+            inputs,
+            args.output_dir,
+            processor_options(args, target_words),
+            workers=args.workers,
+            results_path=args.results,
+            sample_rate=args.sample_rate,
+            padding=args.padding,
+            buffer_frames=args.buffer_frames,
+            partial_reencode=args.partial_reencode,
+            target_speed=args.target_speed,
+            max_sample_gap=args.max_sample_gap,
+            force=args.force
+        )
+
+        failed = [r for r in results['results'].values() if r.get('status') == 'failed']
+        print(f"\nResults manifest: {args.results}")
+        if failed:
+            print(f"❌ {len(failed)} video(s) failed", file=sys.stderr)
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        print("\n\nBatch interrupted by user (rerun to resume)")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
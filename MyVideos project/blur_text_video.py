@@ -5,17 +5,27 @@ Detects and blurs specific text/words in MP4/MOV videos using OCR and OpenCV
 """
 
 import cv2
-import easyocr
-import numpy as np
 from pathlib import Path
 import argparse
 from tqdm import tqdm
 import sys
 import subprocess
+import tempfile
+import time
+from fractions import Fraction
+
+from ocr_backends import BACKENDS, OCRBackend, create_backend
+from text_prefilter import TextPresenceFilter
+from scan_regions import ScanRegions
+from frame_pool import FramePool, FrameReader, peak_rss_mb
+import partial_reencode
+from throughput_governor import ThroughputGovernor, parse_speed
 
 
 class VideoTextBlur:
-    def __init__(self, languages=['en'], blur_strength=51, confidence_threshold=0.5, target_words=None):
+    def __init__(self, languages=['en'], blur_strength=51, confidence_threshold=0.5,
+                 target_words=None, ocr_backend='easyocr', backend_options=None, prefilter=None,
+                 scan_regions=None):
         """
         Initialize the video text blur processor
         
@@ -24,11 +34,20 @@ class VideoTextBlur:
             blur_strength: Blur kernel size (must be odd number, higher = more blur)
             confidence_threshold: Minimum confidence for text detection (0-1)
             target_words: List of words/phrases to blur (case-insensitive). If None, blur all text.
+            ocr_backend: OCR engine ('easyocr', 'tesseract', 'opencv') or an OCRBackend instance
+            backend_options: Extra options for the backend (e.g. {'detector_model': 'east.pb'})
+            prefilter: Optional TextPresenceFilter; frames it rejects skip OCR entirely
+            scan_regions: Optional ScanRegions; only these zones of each frame are OCR'd
         """
-        print("Initializing EasyOCR reader...")
-        self.reader = easyocr.Reader(languages, gpu=True)
+        if isinstance(ocr_backend, OCRBackend):
+            self.reader = ocr_backend
+        else:
+            self.reader = create_backend(ocr_backend, languages, **(backend_options or {}))
         self.blur_strength = blur_strength if blur_strength % 2 == 1 else blur_strength + 1
         self.confidence_threshold = confidence_threshold
+        self.prefilter = prefilter
+        self.scan_regions = scan_regions
+        self.detection_scale = 1.0  # frames are downscaled by this factor before OCR
         self.target_words = [word.lower() for word in target_words] if target_words else None
         
         if self.target_words:
@@ -65,7 +84,7 @@ class VideoTextBlur:
         Returns:
             List of tuples: [(x1, y1, x2, y2, detected_text), ...]
         """
-        results = self.reader.readtext(frame)
+        results = self.ocr_frame(frame)
         boxes = []
         
         for detection in results:
@@ -73,15 +92,69 @@ class VideoTextBlur:
             # Ensure confidence is a float for comparison
             if float(confidence) >= self.confidence_threshold:
                 if self.should_blur_text(text):
-                    # Convert bbox to x1, y1, x2, y2 format
-                    points = np.array(bbox, dtype=np.int32)
-                    x1, y1 = points.min(axis=0)
-                    x2, y2 = points.max(axis=0)
-                    boxes.append((x1, y1, x2, y2, text))
+                    boxes.append(bbox_to_box(bbox) + (text,))
+        
+        if self.scan_regions is not None:
+            boxes = [box for box in boxes if self.scan_regions.allows(box)]
                 
         return boxes
     
-    def blur_regions(self, frame, boxes, padding=10):
+    def ocr_frame(self, frame):
+        """
+        Run OCR on a frame (only its scan regions, if configured)
+        
+        Returns:
+            List of tuples in frame coordinates: [(bbox, text, confidence), ...]
+        """
+        if self.scan_regions is None:
+            return self.run_ocr(frame)
+        
+        # OCR only the configured zones and map results back to frame coordinates
+        results = []
+        for x_offset, y_offset, crop in self.scan_regions.crops(frame):
+            for bbox, text, confidence in self.run_ocr(crop, origin=(x_offset, y_offset)):
+                bbox = [[x + x_offset, y + y_offset] for x, y in bbox]
+                results.append((bbox, text, confidence))
+        return results
+    
+    def run_ocr(self, image, origin=(0, 0)):
+        """
+        Run the OCR backend on an image
+        
+        Args:
+            image: Frame or crop to OCR
+            origin: Frame coordinates of the image's top-left corner
+        
+        Returns:
+            List of tuples: [(bbox, text, confidence), ...]
+        """
+        scale = self.detection_scale
+        if scale < 1.0:
+            image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        
+        if self.target_words is None:
+            # Blur-all mode only needs locations, so skip recognition where the backend allows it
+            results = [(bbox, '', confidence) for bbox, confidence in self.reader.detect(image)]
+        else:
+            results = self.reader.readtext(image, origin=origin)
+        
+        if scale < 1.0:
+            results = [([[x / scale, y / scale] for x, y in bbox], text, confidence)
+                       for bbox, text, confidence in results]
+        return results
+    
+    def scan_frame(self, frame):
+        """
+        Detect text regions to blur, skipping OCR when the prefilter rules text out
+        
+        Returns:
+            List of tuples: [(x1, y1, x2, y2, detected_text), ...]
+        """
+        if self.prefilter and not self.prefilter.might_contain_text(frame):
+            return []
+        return self.detect_text_regions(frame)
+    
+    def blur_regions(self, frame, boxes, padding=10, in_place=False):
         """
         Apply blur to specified regions in the frame
         
@@ -89,8 +162,9 @@ class VideoTextBlur:
             frame: Input frame
             boxes: List of tuples (x1, y1, x2, y2, text) to blur
             padding: Extra pixels around detected text
+            in_place: Blur directly into frame instead of a copy (avoids a full-frame allocation)
         """
-        blurred_frame = frame.copy()
+        blurred_frame = frame if in_place else frame.copy()
         
         for box_data in boxes:
             x1, y1, x2, y2 = box_data[:4]  # Extract coordinates, ignore text
@@ -112,7 +186,8 @@ class VideoTextBlur:
             
         return blurred_frame
     
-    def process_video(self, input_path, output_path, sample_rate=1, padding=10):
+    def process_video(self, input_path, output_path, sample_rate=1, padding=10, buffer_frames=4,
+                      partial_reencode=False, target_speed=None, max_sample_gap=None):
         """
         Process video and blur detected text
         
@@ -121,7 +196,21 @@ class VideoTextBlur:
             output_path: Path to output video
             sample_rate: Process every Nth frame for text detection (1 = every frame)
             padding: Padding around detected text regions
+            buffer_frames: Preallocated frame buffers (caps decoded frames held in memory)
+            partial_reencode: Only re-encode GOPs containing blurred frames
+                (see process_video_partial)
+            target_speed: Realtime factor to hold (e.g. 2.0); adapts sampling, downscale and
+                batch size (not available with partial_reencode)
+            max_sample_gap: Largest OCR interval the governor may use (default: 1 second of frames)
+            
+        Returns:
+            Dict of processing statistics
         """
+        if partial_reencode and target_speed:
+            raise ValueError("target_speed can't be combined with partial_reencode")
+        if partial_reencode:
+            return self.process_video_partial(input_path, output_path, sample_rate, padding)
+        
         input_path = Path(input_path)
         output_path = Path(output_path)
         temp_output = output_path.with_suffix('.temp.mp4')
@@ -156,31 +245,83 @@ class VideoTextBlur:
         
         print(f"\nProcessing video (sampling every {sample_rate} frame(s))...")
         
+        governor = None
+        if target_speed:
+            governor = ThroughputGovernor(target_speed, fps, sample_rate, max_sample_gap)
+            governor.batch_size = self.reader.batch_size
+            print(f"Governor: targeting {target_speed:.2f}x realtime "
+                  f"(OCR interval {governor.min_interval}-{governor.max_interval} frames)")
+        initial_settings = (self.detection_scale, self.reader.batch_size)
+        
         frame_count = 0
+        since_detection = 0
         last_boxes = []
+        self.reader.reset()
+        if self.prefilter:
+            self.prefilter.reset()
         
-        with tqdm(total=total_frames, unit='frame') as pbar:
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                # Detect text on sampled frames
-                if frame_count % sample_rate == 0:
-                    last_boxes = self.detect_text_regions(frame)
-                
-                # Apply blur using last detected boxes
-                if last_boxes:
-                    frame = self.blur_regions(frame, last_boxes, padding)
-                
-                out.write(frame)
-                frame_count += 1
-                pbar.update(1)
+        # Decode into recycled buffers on a read-ahead thread; blur in place
+        pool = FramePool((height, width, 3), size=buffer_frames)
+        frame_reader = FrameReader(cap, pool)
+        
+        try:
+            with tqdm(total=total_frames, unit='frame') as pbar:
+                frame_start = time.perf_counter()
+                for frame in frame_reader:
+                    # Detect text on sampled frames
+                    interval = governor.interval if governor else sample_rate
+                    ocr_elapsed = None
+                    if frame_count == 0 or since_detection >= interval:
+                        ocr_start = time.perf_counter()
+                        last_boxes = self.scan_frame(frame)
+                        ocr_elapsed = time.perf_counter() - ocr_start
+                        since_detection = 0
+                    since_detection += 1
+                    
+                    # Apply blur using last detected boxes
+                    if last_boxes:
+                        self.blur_regions(frame, last_boxes, padding, in_place=True)
+                    
+                    out.write(frame)
+                    frame_reader.release(frame)
+                    
+                    if governor:
+                        now = time.perf_counter()
+                        governor.record_frame(now - frame_start, ocr_elapsed)
+                        frame_start = now
+                        if governor.update(frame_count):
+                            self.detection_scale = governor.scale
+                            self.reader.batch_size = governor.batch_size
+                    
+                    frame_count += 1
+                    pbar.update(1)
+        finally:
+            frame_reader.close()
+            self.detection_scale, self.reader.batch_size = initial_settings
         
         # Cleanup
         cap.release()
         out.release()
         
+        peak_rss = peak_rss_mb()
+        frame_mb = pool.nbytes / buffer_frames / (1024 * 1024)
+        print(f"\nFrame buffers: {buffer_frames} x {frame_mb:.1f} MB")
+        if peak_rss is not None:
+            print(f"Peak memory (RSS): {peak_rss:.0f} MB")
+        
+        if governor:
+            summary = governor.summary()
+            print(f"\nGovernor: achieved {summary['achieved_speed']}x realtime "
+                  f"(target {target_speed:.2f}x), {len(summary['decisions'])} adjustment(s)")
+        
+        if self.scan_regions is not None:
+            print(f"\nScan regions: OCR covered {self.scan_regions.coverage():.0%} of each frame")
+        
+        if self.prefilter:
+            stats = self.prefilter.stats()
+            print(f"\nPrefilter skipped OCR on {stats['frames_skipped']}/{stats['frames_checked']} "
+                  f"sampled frames ({stats['skip_ratio']:.0%})")
+        
         # Convert to QuickTime-compatible format using FFmpeg
         print(f"\nConverting to QuickTime-compatible format...")
         try:
@@ -208,6 +349,429 @@ class VideoTextBlur:
             print(f"  You can manually convert with: ffmpeg -i {temp_output} -c:v libx264 {output_path}")
             if temp_output.exists():
                 temp_output.rename(output_path)
+        
+        stats = {'frames': frame_count, 'buffer_frames': buffer_frames, 'peak_rss_mb': peak_rss}
+        if governor:
+            stats['governor'] = governor.summary()
+        if self.scan_regions is not None:
+            stats['scan_coverage'] = self.scan_regions.coverage()
+        if self.prefilter:
+            stats['prefilter'] = self.prefilter.stats()
+        return stats
+    
+    def process_video_partial(self, input_path, output_path, sample_rate=1, padding=10):
+        """
+        Blur text re-encoding only the GOPs that need it
+        
+        A first pass finds the frames to blur. The video is then split at
+        keyframes: GOPs without blurred frames are stream-copied bit-exactly,
+        the rest are re-encoded with libx264, and the pieces are concatenated
+        (audio is copied from the input). Re-encoded chunks use the source's
+        profile, level, reference frames and B-frame setting, so the spliced
+        stream stays decodable. Falls back to process_video() when the input
+        is not H.264 4:2:0 in a profile libx264 can match, when ffprobe is
+        unavailable, or when a split or seek doesn't land on its keyframe.
+        
+        Args:
+            input_path: Path to input video
+            output_path: Path to output video
+            sample_rate: Process every Nth frame for text detection (1 = every frame)
+            padding: Padding around detected text regions
+            
+        Returns:
+            Dict of processing statistics
+        """
+        input_path = Path(input_path)
+        output_path = Path(output_path)
+        
+        if not input_path.exists():
+            raise FileNotFoundError(f"Input video not found: {input_path}")
+        
+        try:
+            info = partial_reencode.probe_video(input_path)
+            keyframes, keyframe_times, total_frames = partial_reencode.keyframe_index(input_path)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"\n⚠ Warning: Could not read keyframes ({e}). Re-encoding the whole video.")
+            return self.process_video(input_path, output_path, sample_rate, padding)
+        
+        if info.get('codec_name') not in partial_reencode.COPYABLE_CODECS or \
+                info.get('pix_fmt') not in partial_reencode.COPYABLE_PIXEL_FORMATS:
+            print(f"\n⚠ Warning: {info.get('codec_name')}/{info.get('pix_fmt')} GOPs "
+                  f"can't be stream-copied. Re-encoding the whole video.")
+            return self.process_video(input_path, output_path, sample_rate, padding)
+        
+        encoder_options = partial_reencode.encoder_settings(info)
+        if encoder_options is None:
+            print(f"\n⚠ Warning: libx264 can't match the {info.get('profile')} profile "
+                  f"of the copied GOPs. Re-encoding the whole video.")
+            return self.process_video(input_path, output_path, sample_rate, padding)
+        
+        width, height = int(info['width']), int(info['height'])
+        frame_rate = info['r_frame_rate']
+        
+        print(f"\nVideo Info:")
+        print(f"  Resolution: {width}x{height}")
+        print(f"  Frame rate: {frame_rate}")
+        print(f"  Total Frames: {total_frames}")
+        print(f"  Keyframes: {len(keyframes)}")
+        
+        cap = cv2.VideoCapture(str(input_path))
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video: {input_path}")
+        
+        # Pass 1: find which frames need blurring (non-sampled frames are only grabbed)
+        print(f"\nFinding text (sampling every {sample_rate} frame(s))...")
+        self.reader.reset()
+        if self.prefilter:
+            self.prefilter.reset()
+        
+        buffer = None
+        blur_plan = {}  # frame index -> boxes
+        last_boxes = []
+        frame_count = 0
+        with tqdm(total=total_frames, unit='frame') as pbar:
+            while True:
+                if frame_count % sample_rate == 0:
+                    ret, buffer = cap.read(buffer)
+                    if not ret:
+                        break
+                    last_boxes = self.scan_frame(buffer)
+                elif not cap.grab():
+                    break
+                
+                if last_boxes:
+                    blur_plan[frame_count] = last_boxes
+                frame_count += 1
+                pbar.update(1)
+        cap.release()
+        
+        chunks = partial_reencode.plan_chunks(keyframes, frame_count, sorted(blur_plan))
+        time_of = dict(zip(keyframes, keyframe_times))
+        # Split slightly before each keyframe so rounding never pushes the cut to the next one
+        half_frame = 0.5 / float(Fraction(frame_rate))
+        split_times = [time_of[start] - half_frame for start, _, _ in chunks[1:]]
+        reencoded = sum(end - start for start, end, dirty in chunks if dirty)
+        
+        dirty_chunks = sum(1 for c in chunks if c[2])
+        print(f"\nRe-encoding {reencoded}/{frame_count} frames "
+              f"({dirty_chunks} of {len(chunks)} chunks), stream-copying the rest...")
+        
+        with tempfile.TemporaryDirectory(dir=output_path.parent) as work_dir:
+            segments = partial_reencode.split_at_keyframes(input_path, split_times, work_dir)
+            if len(segments) != len(chunks):
+                print(f"\n⚠ Warning: Keyframe split produced {len(segments)} segments, "
+                      f"expected {len(chunks)}. Re-encoding the whole video.")
+                return self.process_video(input_path, output_path, sample_rate, padding)
+            
+            # A cut that slid to another keyframe leaves the segment count intact but not the frames
+            for segment, (start, end, _) in zip(segments, chunks):
+                copied = partial_reencode.count_frames(segment)
+                if copied != end - start:
+                    print(f"\n⚠ Warning: Segment {segment.name} has {copied} frames, "
+                          f"expected frames {start}-{end - 1} ({end - start}). "
+                          f"Re-encoding the whole video.")
+                    return self.process_video(input_path, output_path, sample_rate, padding)
+            
+            # Pass 2: re-encode only the chunks that contain blurred frames, seeking past the rest
+            cap = cv2.VideoCapture(str(input_path))
+            position = 0
+            with tqdm(total=reencoded, unit='frame') as pbar:
+                for i, (start, end, dirty) in enumerate(chunks):
+                    if not dirty:
+                        continue
+                    if position != start:
+                        # Chunks start at keyframes, so this seek doesn't decode the skipped GOPs
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+                        landed = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+                        if landed != start:
+                            cap.release()
+                            print(f"\n⚠ Warning: Seek to frame {start} landed on frame {landed}. "
+                                  f"Re-encoding the whole video.")
+                            return self.process_video(input_path, output_path, sample_rate, padding)
+                    position = end
+                    
+                    chunk_path = Path(work_dir) / f'blur_{i:05d}.ts'
+                    encoder = partial_reencode.open_chunk_encoder(
+                        chunk_path, width, height, frame_rate, encoder_options
+                    )
+                    for index in range(start, end):
+                        ret, buffer = cap.read(buffer)
+                        if not ret:
+                            break
+                        if index in blur_plan:
+                            self.blur_regions(buffer, blur_plan[index], padding, in_place=True)
+                        encoder.stdin.write(buffer.tobytes())
+                        pbar.update(1)
+                    encoder.stdin.close()
+                    if encoder.wait() != 0:
+                        cap.release()
+                        error = encoder.stderr.read().decode(errors='replace')
+                        raise RuntimeError(f"FFmpeg chunk encode failed: {error}")
+                    segments[i] = chunk_path
+            cap.release()
+            
+            partial_reencode.concat_segments(segments, input_path, output_path, work_dir)
+        
+        print(f"\n✓ Video processed successfully!")
+        print(f"  Output saved to: {output_path}")
+        print(f"  Processed {frame_count} frames ({frame_count - reencoded} stream-copied)")
+        
+        stats = {
+            'frames': frame_count,
+            'reencoded_frames': reencoded,
+            'copied_frames': frame_count - reencoded,
+            'chunks': len(chunks)
+        }
+        if self.prefilter:
+            stats['prefilter'] = self.prefilter.stats()
+        return stats
+    
+    def preview_video(self, input_path, frame_count=8, padding=10, thumbnail_width=480):
+        """
+        Dry run: OCR a few evenly spaced frames and report what would be blurred
+        
+        Every detection is returned, not only the matches, so a word list or
+        confidence threshold can be checked before committing to a full run.
+        Nothing is encoded; each sampled frame gets an annotated JPEG thumbnail
+        (matches blurred and outlined in red, other detections in yellow).
+        
+        Args:
+            input_path: Path to input video
+            frame_count: Number of frames to sample
+            padding: Padding around detected text regions
+            thumbnail_width: Thumbnail width in pixels (never upscaled)
+            
+        Returns:
+            Dict with video info and a 'frames' list of
+            {'frame', 'time', 'detections', 'matches', 'thumbnail' (JPEG bytes)}
+        """
+        input_path = Path(input_path)
+        if not input_path.exists():
+            raise FileNotFoundError(f"Input video not found: {input_path}")
+        
+        cap = cv2.VideoCapture(str(input_path))
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video: {input_path}")
+        
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total_frames <= 0:
+            cap.release()
+            raise ValueError(f"Could not read frame count: {input_path}")
+        
+        self.reader.reset()
+        frames = []
+        try:
+            for index in tqdm(preview_frame_indices(total_frames, frame_count), unit='frame'):
+                cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+                ret, frame = cap.read()
+                if not ret:
+                    continue
+                
+                detections = []
+                for bbox, text, confidence in self.ocr_frame(frame):
+                    box = bbox_to_box(bbox)
+                    confidence = float(confidence)
+                    matched = (confidence >= self.confidence_threshold
+                               and self.should_blur_text(text))
+                    if matched and self.scan_regions is not None:
+                        matched = self.scan_regions.allows(box)
+                    detections.append({
+                        'box': list(box),
+                        'text': text,
+                        'confidence': round(confidence, 3),
+                        'matched': matched
+                    })
+                
+                entry = {
+                    'frame': index,
+                    'time': round(index / fps, 3),
+                    'detections': detections,
+                    'matches': sum(1 for d in detections if d['matched']),
+                    'thumbnail': self._preview_thumbnail(
+                        frame, detections, padding, thumbnail_width
+                    )
+                }
+                if self.prefilter:
+                    # Would the prefilter have let this frame through to OCR?
+                    entry['prefilter_passed'] = self.prefilter.might_contain_text(frame)
+                frames.append(entry)
+        finally:
+            cap.release()
+        
+        return {
+            'input': str(input_path),
+            'fps': fps,
+            'total_frames': total_frames,
+            'duration': round(total_frames / fps, 3),
+            'frames': frames,
+            'matched_frames': sum(1 for f in frames if f['matches'])
+        }
+    
+    def _preview_thumbnail(self, frame, detections, padding, width):
+        """Blur and outline matches, outline other detections, and encode a JPEG thumbnail"""
+        matched = [tuple(d['box']) for d in detections if d['matched']]
+        annotated = self.blur_regions(frame, matched, padding)
+        thickness = max(2, frame.shape[1] // 400)
+        for detection in detections:
+            x1, y1, x2, y2 = detection['box']
+            color = (0, 0, 255) if detection['matched'] else (0, 215, 255)
+            cv2.rectangle(annotated, (x1, y1), (x2, y2), color, thickness)
+        
+        if frame.shape[1] > width:
+            scale = width / frame.shape[1]
+            annotated = cv2.resize(annotated, None, fx=scale, fy=scale,
+                                   interpolation=cv2.INTER_AREA)
+        ok, jpeg = cv2.imencode('.jpg', annotated, [cv2.IMWRITE_JPEG_QUALITY, 80])
+        return jpeg.tobytes() if ok else None
+
+
+def bbox_to_box(bbox):
+    """Convert an OCR bbox (four points) to (x1, y1, x2, y2) without a per-detection array"""
+    xs = [int(point[0]) for point in bbox]
+    ys = [int(point[1]) for point in bbox]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def preview_frame_indices(total_frames, count):
+    """Pick count evenly spaced frame indices (the middle of each equal slice of the video)"""
+    count = max(1, min(count, total_frames))
+    return sorted({int((i + 0.5) * total_frames / count) for i in range(count)})
+
+
+def save_preview(preview, output_dir):
+    """
+    Print a preview's detections and write its thumbnails to output_dir
+    
+    Returns:
+        List of thumbnail paths
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    
+    print(f"\nPreview of {len(preview['frames'])} frame(s) from {preview['input']} "
+          f"({preview['duration']:.1f}s, {preview['total_frames']} frames):")
+    for entry in preview['frames']:
+        skipped = not entry.get('prefilter_passed', True)
+        print(f"\n  Frame {entry['frame']} ({entry['time']:.2f}s): "
+              f"{len(entry['detections'])} detection(s), {entry['matches']} to blur"
+              + (" [prefilter would skip this frame]" if skipped else ""))
+        for detection in entry['detections']:
+            marker = 'BLUR' if detection['matched'] else '    '
+            print(f"    {marker} {detection['confidence']:.2f}  "
+                  f"\"{detection['text']}\"  at {detection['box']}")
+        
+        if entry['thumbnail'] is not None:
+            path = output_dir / f"frame_{entry['frame']:06d}.jpg"
+            path.write_bytes(entry['thumbnail'])
+            paths.append(path)
+    
+    print(f"\n✓ {preview['matched_frames']}/{len(preview['frames'])} sampled frames "
+          f"have text to blur")
+    print(f"  Annotated thumbnails saved to: {output_dir}")
+    return paths
+
+
+def positive_int(value):
+    """argparse type for options that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value}")
+    return number
+
+
+def add_processing_arguments(parser):
+    """Add the OCR and blur options shared by the single-video and batch CLIs"""
+    parser.add_argument('--languages', nargs='+', default=['en'],
+                        help='OCR languages (default: en)')
+    parser.add_argument('--blur', type=int, default=51,
+                        help='Blur strength (odd number, default: 51)')
+    parser.add_argument('--confidence', type=float, default=0.5,
+                        help='Text detection confidence threshold 0-1 (default: 0.5)')
+    parser.add_argument('--sample-rate', type=int, default=1,
+                        help='Process every Nth frame for detection (default: 1)')
+    parser.add_argument('--padding', type=int, default=10,
+                        help='Padding around text regions in pixels (default: 10)')
+    parser.add_argument('--buffer-frames', type=positive_int, default=4,
+                        help='Preallocated frame buffers per job; caps decoded frames in memory '
+                             '(default: 4)')
+    parser.add_argument('--target-speed', type=parse_speed, default=None, metavar='FACTOR',
+                        help='Realtime factor to hold, e.g. 2x; '
+                             'adapts OCR sampling, downscale and batch size')
+    parser.add_argument('--max-sample-gap', type=int, default=None,
+                        help='Largest OCR interval in frames when speeding up '
+                             '(default: 1 second of video)')
+    parser.add_argument('--partial-reencode', action='store_true',
+                        help='Only re-encode GOPs that contain blurred frames; '
+                             'stream-copy the rest (H.264 input)')
+    parser.add_argument('--ocr-backend', choices=BACKENDS, default='easyocr',
+                        help='OCR engine (default: easyocr)')
+    parser.add_argument('--detector-model', default=None,
+                        help='EAST (.pb) or DB (.onnx) model for the opencv backend')
+    parser.add_argument('--detector-type', choices=['east', 'db'], default='east',
+                        help='Detector architecture for the opencv backend (default: east)')
+    parser.add_argument('--recognizer-model', default=None,
+                        help='CRNN (.onnx) model for the opencv backend '
+                             '(default: Tesseract on crops)')
+    parser.add_argument('--vocabulary', default=None,
+                        help='Vocabulary file for --recognizer-model')
+    parser.add_argument('--prefilter', action='store_true',
+                        help='Skip OCR on frames that a fast heuristic finds free of text')
+    parser.add_argument('--prefilter-candidates', type=positive_int, default=3,
+                        help='Character-like regions needed to run OCR; '
+                             'lower = fewer missed frames (default: 3)')
+    parser.add_argument('--prefilter-contrast', type=positive_int, default=32,
+                        help='Gradient (0-255) a text line needs to run OCR; '
+                             'lower = fewer missed frames (default: 32)')
+    parser.add_argument('--roi', action='append', default=None, metavar='X,Y,W,H',
+                        help='Only OCR this zone (pixels, or fractions when all values <= 1). '
+                             'Repeatable.')
+    parser.add_argument('--exclude', action='append', default=None, metavar='X,Y,W,H',
+                        help='Never OCR this zone (same format as --roi). Repeatable.')
+    parser.add_argument('--roi-mask', default=None,
+                        help='Mask image; only non-black areas are OCR\'d')
+
+
+def processor_options(args, target_words):
+    """
+    Collect VideoTextBlur settings from parsed CLI arguments
+    
+    Returns:
+        Plain dict (safe to send to worker processes) for build_processor()
+    """
+    return {
+        'languages': args.languages,
+        'blur_strength': args.blur,
+        'confidence_threshold': args.confidence,
+        'target_words': target_words,
+        'ocr_backend': args.ocr_backend,
+        'backend_options': {
+            'detector_model': args.detector_model,
+            'detector_type': args.detector_type,
+            'recognizer_model': args.recognizer_model,
+            'vocabulary': args.vocabulary
+        },
+        'prefilter': {
+            'min_candidates': args.prefilter_candidates,
+            'min_contrast': args.prefilter_contrast
+        } if args.prefilter else None,
+        'scan_regions': {
+            'include': args.roi,
+            'exclude': args.exclude,
+            'mask_path': args.roi_mask
+        } if (args.roi or args.exclude or args.roi_mask) else None
+    }
+
+
+def build_processor(options):
+    """Create a VideoTextBlur from a processor_options() dict"""
+    options = dict(options)
+    if options.get('prefilter') is not None:
+        options['prefilter'] = TextPresenceFilter(**options['prefilter'])
+    if options.get('scan_regions') is not None:
+        options['scan_regions'] = ScanRegions(**options['scan_regions'])
+    return VideoTextBlur(**options)
 
 
 def main():
@@ -230,6 +794,24 @@ Examples:
   
   # Multiple languages
   python blur_text_video.py input.mp4 output.mp4 --words "mot" "texte" --languages en fr
+  
+  # Skip OCR on text-free frames (camera shots, transitions)
+  python blur_text_video.py input.mp4 output.mp4 --words "secret" --prefilter
+  
+  # Only OCR a chat sidebar (right quarter of the frame), never the webcam overlay
+  python blur_text_video.py input.mp4 output.mp4 --words "email" --roi 0.75,0,0.25,1 --exclude 1500,900,420,180
+  
+  # Sparse text in a long recording: keep untouched GOPs bit-exact
+  python blur_text_video.py input.mp4 output.mp4 --words "password" --partial-reencode
+  
+  # Predictable duration: hold 2x realtime, never leaving more than 15 frames between OCR samples
+  python blur_text_video.py input.mp4 output.mp4 --words "secret" --target-speed 2x --max-sample-gap 15
+  
+  # Check the word list on 10 frames first (thumbnails go to output_preview/)
+  python blur_text_video.py input.mp4 output.mp4 --words "secret" --confidence 0.4 --preview 10
+  
+  # Cheap OpenCV EAST detector (no recognition needed with --blur-all)
+  python blur_text_video.py input.mp4 output.mp4 --blur-all --ocr-backend opencv --detector-model frozen_east_text_detection.pb
         """
     )
     
@@ -239,19 +821,19 @@ Examples:
                         help='Specific words/phrases to blur (case-insensitive). If not provided, will prompt interactively.')
     parser.add_argument('--blur-all', action='store_true',
                         help='Blur ALL detected text (ignores --words)')
-    parser.add_argument('--languages', nargs='+', default=['en'],
-                        help='OCR languages (default: en)')
-    parser.add_argument('--blur', type=int, default=51,
-                        help='Blur strength (odd number, default: 51)')
-    parser.add_argument('--confidence', type=float, default=0.5,
-                        help='Text detection confidence threshold 0-1 (default: 0.5)')
-    parser.add_argument('--sample-rate', type=int, default=1,
-                        help='Process every Nth frame for detection (default: 1)')
-    parser.add_argument('--padding', type=int, default=10,
-                        help='Padding around text regions in pixels (default: 10)')
+    parser.add_argument('--preview', type=int, default=None, metavar='N',
+                        help='Dry run: OCR N evenly spaced frames, list detections and save '
+                             'annotated thumbnails to <output>_preview/ '
+                             'instead of processing the video')
+    add_processing_arguments(parser)
     
     args = parser.parse_args()
     
+    if args.preview is not None and args.preview < 1:
+        parser.error('--preview needs at least 1 frame')
+    if args.partial_reencode and args.target_speed:
+        parser.error('--target-speed is not available with --partial-reencode')
+    
     try:
         # Determine target words
         target_words = None
@@ -282,19 +864,24 @@ Examples:
                 target_words = None
         
         # Initialize processor
-        processor = VideoTextBlur(
-            languages=args.languages,
-            blur_strength=args.blur,
-            confidence_threshold=args.confidence,
-            target_words=target_words
-        )
+        processor = build_processor(processor_options(args, target_words))
+        
+        if args.preview:
+            output = Path(args.output)
+            preview = processor.preview_video(args.input, args.preview, padding=args.padding)
+            save_preview(preview, output.parent / f"{output.stem}_preview")
+            return
         
         # Process video
         processor.process_video(
             input_path=args.input,
             output_path=args.output,
             sample_rate=args.sample_rate,
-            padding=args.padding
+            padding=args.padding,
+            buffer_frames=args.buffer_frames,
+            partial_reencode=args.partial_reencode,
+            target_speed=args.target_speed,
+            max_sample_gap=args.max_sample_gap
         )
         
     except KeyboardInterrupt:
@@ -66,10 +66,35 @@ def example_batch_processing():
             )
 
 
+def example_batch_directory():
+    """Example: Process a whole directory concurrently with resumable results"""
+    print("\n" + "=" * 60)
+    print("Example 4: Concurrent Batch Processing")
+    print("=" * 60)
+    
+    from batch_blur import collect_inputs, run_batch
+    
+    inputs = collect_inputs(['videos/'])
+    options = {
+        'languages': ['en'],
+        'target_words': ['password', 'secret']
+    }
+    
+    # Each of the 2 workers loads the OCR model once; rerunning skips completed files
+    run_batch(
+        inputs,
+        output_dir='blurred/',
+        options=options,
+        workers=2,
+        results_path='batch_results.json',
+        sample_rate=3
+    )
+
+
 def example_with_error_handling():
     """Example with proper error handling"""
     print("\n" + "=" * 60)
-    print("Example 4: With Error Handling")
+    print("Example 5: With Error Handling")
     print("=" * 60)
     
     try:
@@ -113,6 +138,7 @@ if __name__ == '__main__':
     # example_basic()
     # example_custom_settings()
     # example_batch_processing()
+    # example_batch_directory()
     # example_with_error_handling()
     
     print("\nTo run an example, uncomment it in the __main__ section.")
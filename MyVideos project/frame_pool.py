@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Frame Buffer Pool
+Preallocated, recycled frame buffers and a read-ahead thread for process_video
+"""
+
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class FramePool:
+    def __init__(self, shape, size=4, dtype=np.uint8):
+        """
+        Initialize a fixed set of reusable frame buffers
+
+        Args:
+            shape: Frame shape (height, width, channels)
+            size: Number of buffers (at least 1); caps the frames held in memory per job
+            dtype: Buffer dtype
+        """
+        if size < 1:
+            raise ValueError(f"Frame pool needs at least 1 buffer: {size}")
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.size = size
+        self._ids = set()
+        self._free = queue.Queue()
+        for _ in range(size):
+            buffer = np.empty(self.shape, dtype=dtype)
+            self._ids.add(id(buffer))
+            self._free.put(buffer)
+
+    @property
+    def nbytes(self):
+        """Total bytes held by the pool"""
+        return self.size * int(np.prod(self.shape)) * self.dtype.itemsize
+
+    def acquire(self, timeout=None):
+        """Take a free buffer, blocking until one is released (raises queue.Empty on timeout)"""
+        return self._free.get(timeout=timeout)
+
+    def release(self, buffer):
+        """Return a buffer to the pool (arrays not owned by the pool are ignored)"""
+        if id(buffer) in self._ids:
+            self._free.put(buffer)
+
+
+class FrameReader:
+    """
+    Reads frames from a cv2.VideoCapture into pool buffers on a background thread
+
+    Decoding overlaps with OCR and encoding, and never gets more than the
+    pool size ahead, even when the decoder returns its own arrays instead
+    of filling pool buffers. Consumers must release() each frame once written.
+    Any object with a cv2-style read(buffer) -> (ret, frame) method works as cap.
+    """
+
+    def __init__(self, cap, pool):
+        self.cap = cap
+        self.pool = pool
+        self.last_arrival = None  # time.monotonic() when the last yielded frame was read from cap
+        self.last_requested = None  # time.monotonic() when reading that frame started
+        self._frames = queue.Queue(maxsize=pool.size)
+        self._stop = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                try:
+                    buffer = self.pool.acquire(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                requested = time.monotonic()
+                ret, frame = self.cap.read(buffer)
+                if not ret:
+                    self.pool.release(buffer)
+                    break
+                if frame is not buffer:
+                    # Decoder returned a different size/type; hand back the unused buffer
+                    self.pool.release(buffer)
+                if not self._put((frame, requested, time.monotonic())):
+                    break
+        except Exception as e:
+            self._error = e
+        finally:
+            self._put(None)
+
+    def _put(self, item):
+        """Queue an item, waiting for room unless close() was called. Returns True if queued."""
+        while not self._stop.is_set():
+            try:
+                self._frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self):
+        while True:
+            item = self._frames.get()
+            if item is None:
+                if self._error is not None:
+                    raise self._error
+                return
+            frame, self.last_requested, self.last_arrival = item
+            yield frame
+
+    def backlog(self):
+        """Number of decoded frames waiting to be consumed"""
+        return self._frames.qsize()
+
+    def release(self, frame):
+        """Recycle a frame's buffer once it has been written"""
+        self.pool.release(frame)
+
+    def close(self):
+        """Stop reading ahead and wait for the thread to finish"""
+        self._stop.set()
+        self._thread.join()
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+OCR Backends for the Video Text Blur Tool
+Pluggable text detection/recognition engines used by VideoTextBlur
+"""
+
+import cv2
+import numpy as np
+
+
+BACKENDS = ('easyocr', 'tesseract', 'opencv')
+
+# EasyOCR language codes mapped to their Tesseract equivalents
+TESSERACT_LANGUAGES = {
+    'en': 'eng', 'fr': 'fra', 'de': 'deu', 'es': 'spa', 'it': 'ita',
+    'pt': 'por', 'nl': 'nld', 'ru': 'rus', 'ja': 'jpn', 'ko': 'kor',
+    'ch_sim': 'chi_sim', 'ch_tra': 'chi_tra', 'ar': 'ara',
+}
+
+
+class OCRBackend:
+    """
+    Base class for OCR engines
+
+    Subclasses implement readtext(), which mirrors easyocr.Reader.readtext and
+    returns [(bbox, text, confidence), ...] with bbox as four (x, y) points.
+    Backends with a cheaper localization step override detect() so callers
+    that don't need the text (e.g. blur-all mode) can skip recognition.
+    Backends that batch recognition set batch_size to an int.
+    """
+
+    name = None
+    batch_size = None
+
+    def readtext(self, frame, origin=(0, 0)):
+        """
+        Detect and recognize text in a frame
+
+        Args:
+            frame: Image to read (a whole frame, or a crop of one)
+            origin: Frame coordinates of the image's top-left corner, so backends
+                that cache results between calls can tell crops apart
+
+        Returns:
+            List of tuples: [(bbox, text, confidence), ...]
+        """
+        raise NotImplementedError
+
+    def detect(self, frame):
+        """
+        Localize text in a frame without recognizing it
+
+        Returns:
+            List of tuples: [(bbox, confidence), ...]
+        """
+        return [(bbox, confidence) for bbox, _, confidence in self.readtext(frame)]
+
+    def reset(self):
+        """Clear any per-video state (called before processing a new video)"""
+        pass
+
+
+class EasyOCRBackend(OCRBackend):
+    """Deep-learning detector + recognizer from EasyOCR (default, most accurate)"""
+
+    name = 'easyocr'
+
+    def __init__(self, languages=['en'], gpu=True):
+        try:
+            import easyocr
+        except ImportError:
+            raise ImportError("EasyOCR backend requires easyocr: pip install easyocr")
+
+        print("Initializing EasyOCR reader...")
+        self.reader = easyocr.Reader(languages, gpu=gpu)
+        self.batch_size = 1
+
+    def readtext(self, frame, origin=(0, 0)):
+        return self.reader.readtext(frame, batch_size=self.batch_size)
+
+    def detect(self, frame):
+        # CRAFT detection only; its boxes already passed EasyOCR's text threshold,
+        # and it reports no per-box score
+        horizontal, free = self.reader.detect(frame)
+        results = []
+        for x_min, x_max, y_min, y_max in horizontal[0]:
+            bbox = [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+            results.append((bbox, 1.0))
+        for quad in free[0]:
+            results.append(([[int(x), int(y)] for x, y in quad], 1.0))
+        return results
+
+
+class TesseractBackend(OCRBackend):
+    """Tesseract OCR via pytesseract, grouping words into text lines"""
+
+    name = 'tesseract'
+
+    def __init__(self, languages=['en'], psm=11):
+        """
+        Args:
+            languages: EasyOCR-style language codes (mapped to Tesseract codes)
+            psm: Tesseract page segmentation mode (11 = sparse text)
+        """
+        try:
+            import pytesseract
+        except ImportError:
+            raise ImportError("Tesseract backend requires pytesseract: pip install pytesseract")
+
+        print("Initializing Tesseract OCR...")
+        self.pytesseract = pytesseract
+        self.lang = '+'.join(TESSERACT_LANGUAGES.get(lang, lang) for lang in languages)
+        self.config = f'--psm {psm}'
+
+    def readtext(self, frame, origin=(0, 0)):
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        data = self.pytesseract.image_to_data(
+            rgb, lang=self.lang, config=self.config,
+            output_type=self.pytesseract.Output.DICT
+        )
+
+        # Group words into lines so multi-word target phrases can match
+        lines = {}
+        for i, word in enumerate(data['text']):
+            confidence = float(data['conf'][i])
+            if not word.strip() or confidence < 0:
+                continue
+            key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            lines.setdefault(key, []).append((
+                data['left'][i], data['top'][i],
+                data['left'][i] + data['width'][i], data['top'][i] + data['height'][i],
+                word, confidence / 100.0
+            ))
+
+        results = []
+        for words in lines.values():
+            x1 = min(w[0] for w in words)
+            y1 = min(w[1] for w in words)
+            x2 = max(w[2] for w in words)
+            y2 = max(w[3] for w in words)
+            text = ' '.join(w[4] for w in words)
+            confidence = min(w[5] for w in words)
+            results.append(([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], text, confidence))
+
+        return results
+
+
+class OpenCVDNNBackend(OCRBackend):
+    """
+    OpenCV DNN text detector (EAST or DB) paired with a recognizer
+
+    Detection is cheap enough to run on every frame. Recognition only runs on
+    regions that were not already recognized in the previous call on the
+    same image region (see readtext's origin), so text that stays on screen
+    is read once. A region is read again when its pixels change (text
+    replaced in place, like subtitles or a field being typed into) and at
+    least every reuse_refresh calls. The recognizer is either an OpenCV
+    CRNN model or, when no model is given, Tesseract on the cropped region.
+    """
+
+    name = 'opencv'
+
+    def __init__(self, detector_model, detector_type='east', recognizer_model=None,
+                 vocabulary=None, languages=['en'], detection_threshold=0.5,
+                 reuse_iou=0.6, reuse_max_diff=8.0, reuse_refresh=30):
+        """
+        Args:
+            detector_model: Path to EAST (.pb) or DB (.onnx) detection model
+            detector_type: 'east' or 'db'
+            recognizer_model: Path to CRNN (.onnx) recognition model (optional)
+            vocabulary: Path to the recognizer's vocabulary file, one symbol per line
+            languages: Languages for the Tesseract fallback recognizer
+            detection_threshold: Minimum detector score for a text region
+            reuse_iou: Overlap needed to reuse a previous recognition result
+            reuse_max_diff: Largest mean absolute difference (0-255) between a
+                region's pixels and the recognized ones for the result to be reused
+            reuse_refresh: Calls after which a region is recognized again regardless
+        """
+        if not detector_model:
+            raise ValueError("OpenCV backend requires a detector model (EAST .pb or DB .onnx)")
+
+        print(f"Initializing OpenCV {detector_type.upper()} text detector...")
+        if detector_type == 'east':
+            self.detector = cv2.dnn_TextDetectionModel_EAST(str(detector_model))
+            self.detector.setConfidenceThreshold(detection_threshold)
+            self.detector.setNMSThreshold(0.4)
+            self.detector.setInputParams(1.0, (320, 320), (123.68, 116.78, 103.94), True)
+        elif detector_type == 'db':
+            self.detector = cv2.dnn_TextDetectionModel_DB(str(detector_model))
+            self.detector.setBinaryThreshold(0.3)
+            self.detector.setPolygonThreshold(detection_threshold)
+            self.detector.setMaxCandidates(200)
+            self.detector.setUnclipRatio(2.0)
+            self.detector.setInputParams(1.0 / 255.0, (736, 736), (122.68, 116.67, 104.01), True)
+        else:
+            raise ValueError(f"Unknown detector type: {detector_type} (expected 'east' or 'db')")
+
+        self.recognizer = None
+        self.fallback = None
+        if recognizer_model:
+            if not vocabulary:
+                raise ValueError("A vocabulary file is required with a recognizer model")
+            with open(vocabulary, encoding='utf-8') as f:
+                symbols = [line.rstrip('\n') for line in f if line.rstrip('\n')]
+            self.recognizer = cv2.dnn_TextRecognitionModel(str(recognizer_model))
+            self.recognizer.setDecodeType('CTC-greedy')
+            self.recognizer.setVocabulary(symbols)
+            self.recognizer.setInputParams(1.0 / 127.5, (100, 32), (127.5, 127.5, 127.5))
+        else:
+            self.fallback = TesseractBackend(languages, psm=7)
+
+        self.reuse_iou = reuse_iou
+        self.reuse_max_diff = reuse_max_diff
+        self.reuse_refresh = reuse_refresh
+        # {(origin, image size): [((x1, y1, x2, y2), text, thumbnail, age), ...]} from the
+        # last call on each region; thumbnail is the recognized pixels, age the calls since
+        self.previous = {}
+
+    def detect(self, frame):
+        quads, confidences = self.detector.detect(frame)
+        results = []
+        for quad, confidence in zip(quads, confidences):
+            bbox = [[int(x), int(y)] for x, y in np.asarray(quad).reshape(-1, 2)]
+            results.append((bbox, float(confidence)))
+        return results
+
+    def recognize(self, frame, rect):
+        """Recognize the text inside an axis-aligned rectangle of the frame"""
+        x1, y1, x2, y2 = rect
+        crop = frame[y1:y2, x1:x2]
+        if crop.size == 0:
+            return ''
+        if self.recognizer is not None:
+            return self.recognizer.recognize(crop)
+        pytesseract = self.fallback.pytesseract
+        rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+        return pytesseract.image_to_string(rgb, lang=self.fallback.lang,
+                                           config=self.fallback.config).strip()
+
+    def readtext(self, frame, origin=(0, 0)):
+        height, width = frame.shape[:2]
+        results = []
+        current = []
+        # Crops of different zones (or a downscaled frame) share local coordinates,
+        # so each keeps its own previous results
+        key = (tuple(origin), (width, height))
+        previous = self.previous.get(key, [])
+
+        for bbox, confidence in self.detect(frame):
+            points = np.array(bbox)
+            x1, y1 = np.clip(points.min(axis=0), 0, [width, height])
+            x2, y2 = np.clip(points.max(axis=0), 0, [width, height])
+            rect = (int(x1), int(y1), int(x2), int(y2))
+            thumbnail = region_thumbnail(frame, rect)
+
+            reused = self._reuse(rect, thumbnail, previous)
+            if reused is None:
+                text = self.recognize(frame, rect)
+                current.append((rect, text, thumbnail, 0))
+            else:
+                text, recognized, age = reused
+                current.append((rect, text, recognized, age + 1))
+            results.append((bbox, text, confidence))
+
+        self.previous[key] = current
+        return results
+
+    def reset(self):
+        self.previous = {}
+
+    def _reuse(self, rect, thumbnail, previous):
+        """
+        Find a previous result that still holds for rect
+
+        Returns:
+            Tuple (text, recognized thumbnail, age) of an overlapping region whose
+            pixels haven't changed since it was recognized, or None
+        """
+        if thumbnail is None:
+            return None
+        for previous_rect, text, recognized, age in previous:
+            if age + 1 >= self.reuse_refresh or recognized is None:
+                continue
+            if box_iou(rect, previous_rect) < self.reuse_iou:
+                continue
+            if cv2.absdiff(thumbnail, recognized).mean() <= self.reuse_max_diff:
+                return text, recognized, age
+        return None
+
+
+def region_thumbnail(frame, rect, size=(32, 16)):
+    """Small grayscale copy of a frame region, to tell whether its content changed"""
+    x1, y1, x2, y2 = rect
+    crop = frame[y1:y2, x1:x2]
+    if crop.size == 0:
+        return None
+    if crop.ndim == 3:
+        crop = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(crop, size, interpolation=cv2.INTER_AREA)
+
+
+def box_iou(a, b):
+    """Intersection over union of two (x1, y1, x2, y2) rectangles"""
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    intersection = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def create_backend(name='easyocr', languages=['en'], **options):
+    """
+    Create an OCR backend by name
+
+    Args:
+        name: One of BACKENDS ('easyocr', 'tesseract', 'opencv')
+        languages: List of languages for OCR
+        **options: Backend-specific options (e.g. detector_model for 'opencv')
+
+    Returns:
+        OCRBackend instance
+    """
+    if name == 'easyocr':
+        return EasyOCRBackend(languages, gpu=options.get('gpu', True))
+    if name == 'tesseract':
+        return TesseractBackend(languages)
+    if name == 'opencv':
+        return OpenCVDNNBackend(
+            detector_model=options.get('detector_model'),
+            detector_type=options.get('detector_type', 'east'),
+            recognizer_model=options.get('recognizer_model'),
+            vocabulary=options.get('vocabulary'),
+            languages=languages
+        )
+    raise ValueError(f"Unknown OCR backend: {name} (choose from {', '.join(BACKENDS)})")
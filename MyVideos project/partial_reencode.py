@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Partial Re-encode Helpers
+Split a video at keyframes so only GOPs that contain blurred frames are re-encoded;
+all other GOPs are stream-copied bit-exactly and the pieces are stitched back together
+"""
+
+import bisect
+import json
+import subprocess
+from pathlib import Path
+
+
+# Codecs/pixel formats whose copied GOPs can be concatenated with libx264 output
+COPYABLE_CODECS = {'h264'}
+COPYABLE_PIXEL_FORMATS = {'yuv420p', 'yuvj420p'}
+
+# ffprobe H.264 profile names libx264 can encode to
+# (the profile also fixes CABAC and 8x8 transforms)
+X264_PROFILES = {
+    'Constrained Baseline': 'baseline',
+    'Baseline': 'baseline',
+    'Main': 'main',
+    'High': 'high',
+}
+
+
+def probe_video(path):
+    """
+    Read the first video stream's codec parameters with ffprobe
+
+    Returns:
+        Dict with codec_name, pix_fmt, width, height, r_frame_rate (e.g. '30000/1001'),
+        profile, level, refs and has_b_frames
+    """
+    result = subprocess.run([
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries',
+        'stream=codec_name,pix_fmt,width,height,r_frame_rate,profile,level,refs,has_b_frames',
+        '-of', 'json',
+        str(path)
+    ], check=True, capture_output=True, text=True)
+    streams = json.loads(result.stdout).get('streams', [])
+    if not streams:
+        raise ValueError(f"No video stream found: {path}")
+    return streams[0]
+
+
+def keyframe_index(path):
+    """
+    List keyframes from packet flags (no decoding needed)
+
+    Returns:
+        Tuple (keyframes, times, total_frames): keyframe frame indices in
+        presentation order, their timestamps in seconds from the stream's
+        first frame (its start_time), and the frame count
+    """
+    result = subprocess.run([
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'packet=pts_time,flags',
+        '-of', 'csv=p=0',
+        str(path)
+    ], check=True, capture_output=True, text=True)
+
+    packets = []
+    for line in result.stdout.splitlines():
+        parts = line.strip().split(',')
+        if len(parts) < 2 or parts[0] in ('', 'N/A'):
+            continue
+        packets.append((float(parts[0]), 'K' in parts[1]))
+
+    # Packets are in decode order; frame indices follow presentation order
+    packets.sort()
+    # Stream-copied timestamps start from the first frame, so that is where split times count from
+    start_time = packets[0][0] if packets else 0.0
+    keyframes = [i for i, (_, key) in enumerate(packets) if key]
+    times = [packets[i][0] - start_time for i in keyframes]
+    if not keyframes or keyframes[0] != 0:
+        # Leading frames before the first keyframe belong to the first chunk
+        keyframes.insert(0, 0)
+        times.insert(0, 0.0)
+    return keyframes, times, len(packets)
+
+
+def plan_chunks(keyframes, total_frames, dirty_frames):
+    """
+    Group GOPs into runs that are either all copied or all re-encoded
+
+    Args:
+        keyframes: Sorted keyframe frame indices, starting at 0
+        total_frames: Number of frames in the video
+        dirty_frames: Sorted frame indices that need blurring
+
+    Returns:
+        List of tuples: [(start_frame, end_frame, needs_reencode), ...] with end exclusive
+    """
+    bounds = keyframes + [total_frames]
+    chunks = []
+    for start, end in zip(bounds, bounds[1:]):
+        if start >= end:
+            continue
+        i = bisect.bisect_left(dirty_frames, start)
+        dirty = i < len(dirty_frames) and dirty_frames[i] < end
+        if chunks and chunks[-1][2] == dirty:
+            chunks[-1] = (chunks[-1][0], end, dirty)
+        else:
+            chunks.append((start, end, dirty))
+    return chunks
+
+
+def split_at_keyframes(input_path, split_times, work_dir):
+    """
+    Stream-copy the video into MPEG-TS segments split at the given keyframe times
+
+    The segment muxer sees stream-copied timestamps shifted to start at
+    the first frame, so split_times count from the stream's start_time (as
+    keyframe_index() returns them), not absolute pts_time values.
+
+    Returns:
+        List of segment paths, in order
+    """
+    work_dir = Path(work_dir)
+    command = [
+        'ffmpeg', '-v', 'error', '-i', str(input_path),
+        '-map', '0:v:0', '-c', 'copy', '-bsf:v', 'h264_mp4toannexb',
+        '-f', 'segment', '-reset_timestamps', '1'
+    ]
+    if split_times:
+        command += ['-segment_times', ','.join(f'{t:.6f}' for t in split_times)]
+    command += ['-y', str(work_dir / 'copy_%05d.ts')]
+    subprocess.run(command, check=True, capture_output=True)
+    return sorted(work_dir.glob('copy_*.ts'))
+
+
+def count_frames(path):
+    """Count a video's frames from its packets (no decoding needed)"""
+    result = subprocess.run([
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-count_packets',
+        '-show_entries', 'stream=nb_read_packets',
+        '-of', 'csv=p=0',
+        str(path)
+    ], check=True, capture_output=True, text=True)
+    return int(result.stdout.strip().split(',')[0])
+
+
+def encoder_settings(info):
+    """
+    libx264 options that make re-encoded chunks match the copied GOPs
+
+    The concatenated MP4 describes the stream (avcC) from its first segment
+    only, so decoders such as QuickTime's expect every GOP to use the same
+    profile, level, reference frames, B-frame reordering and pixel format.
+    Entropy coding and 8x8 transforms follow from the profile.
+
+    Args:
+        info: probe_video() result
+
+    Returns:
+        List of ffmpeg output options, or None if libx264 can't match the stream
+    """
+    profile = X264_PROFILES.get(info.get('profile'))
+    if profile is None or info.get('pix_fmt') not in COPYABLE_PIXEL_FORMATS:
+        return None
+
+    options = ['-profile:v', profile, '-pix_fmt', info['pix_fmt']]
+    level = int(info.get('level') or 0)
+    if level > 0:
+        # ffprobe reports level 3.1 as 31, and level 1b as 9
+        options += ['-level:v', '1b' if level == 9 else f'{level // 10}.{level % 10}']
+    refs = int(info.get('refs') or 0)
+    if refs > 0:
+        options += ['-refs', str(refs)]
+    if int(info.get('has_b_frames') or 0) == 0:
+        options += ['-bf', '0']
+    return options
+
+
+def open_chunk_encoder(path, width, height, frame_rate, encoder_options=('-pix_fmt', 'yuv420p')):
+    """
+    Start an ffmpeg process that encodes raw BGR frames from stdin to an H.264 MPEG-TS chunk
+
+    Args:
+        encoder_options: encoder_settings() for the source, so the chunk matches the copied GOPs
+            (default: libx264 defaults in 4:2:0)
+
+    Returns:
+        subprocess.Popen with a writable stdin
+    """
+    return subprocess.Popen([
+        'ffmpeg', '-v', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+        '-s', f'{width}x{height}', '-r', str(frame_rate),
+        '-i', '-',
+        '-c:v', 'libx264',
+        '-preset', 'medium',
+        '-crf', '23',
+        *encoder_options,
+        '-f', 'mpegts',
+        '-y', str(path)
+    ], stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def concat_segments(segments, audio_source, output_path, work_dir):
+    """Stitch segments into the final file, copying audio from the original input"""
+    list_path = Path(work_dir) / 'segments.txt'
+    list_path.write_text(''.join(f"file '{Path(s).resolve()}'\n" for s in segments))
+    subprocess.run([
+        'ffmpeg', '-v', 'error',
+        '-f', 'concat', '-safe', '0', '-i', str(list_path),
+        '-i', str(audio_source),
+        '-map', '0:v:0', '-map', '1:a?',
+        '-c', 'copy',
+        '-movflags', '+faststart',
+        '-y', str(output_path)
+    ], check=True, capture_output=True)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Scan Regions for the Video Text Blur Tool
+Restricts OCR to configured zones of the frame (ROI rectangles or a mask image)
+"""
+
+import cv2
+import numpy as np
+
+
+def parse_rect(value):
+    """
+    Parse an "x,y,w,h" rectangle
+
+    Values are pixels, or fractions of the frame size when all four are <= 1
+    (e.g. "0.75,0,0.25,1" is the right quarter of the frame).
+
+    Returns:
+        Tuple (x, y, w, h) of floats
+    """
+    parts = [p.strip() for p in str(value).split(',')]
+    if len(parts) != 4:
+        raise ValueError(f"Rectangle must be x,y,w,h: {value}")
+    x, y, w, h = (float(p) for p in parts)
+    if w <= 0 or h <= 0 or x < 0 or y < 0:
+        raise ValueError(f"Rectangle must have non-negative origin and positive size: {value}")
+    return (x, y, w, h)
+
+
+class ScanRegions:
+    def __init__(self, include=None, exclude=None, mask_path=None):
+        """
+        Initialize the OCR scan regions
+
+        Args:
+            include: List of (x, y, w, h) rectangles to scan. If None (and no mask), scan the
+                whole frame.
+            exclude: List of (x, y, w, h) rectangles that never need scanning
+            mask_path: Optional mask image; non-black pixels are scanned (combined with include)
+        """
+        self.include = [parse_rect(r) if isinstance(r, str) else tuple(r) for r in (include or [])]
+        self.exclude = [parse_rect(r) if isinstance(r, str) else tuple(r) for r in (exclude or [])]
+        self.mask_image = None
+        if mask_path:
+            self.mask_image = cv2.imread(str(mask_path), cv2.IMREAD_GRAYSCALE)
+            if self.mask_image is None:
+                raise ValueError(f"Could not read ROI mask image: {mask_path}")
+
+        self._size = None
+        self._mask = None
+        self._crops = []  # [(x1, y1, x2, y2, needs_masking), ...]
+
+    def _prepare(self, width, height):
+        """Build the pixel mask and the crops to OCR for a frame size"""
+        if self.include or self.mask_image is not None:
+            mask = np.zeros((height, width), dtype=np.uint8)
+            for rect in self.include:
+                x1, y1, x2, y2 = self._to_pixels(rect, width, height)
+                mask[y1:y2, x1:x2] = 255
+            if self.mask_image is not None:
+                resized = cv2.resize(self.mask_image, (width, height),
+                                     interpolation=cv2.INTER_NEAREST)
+                mask[resized > 0] = 255
+        else:
+            mask = np.full((height, width), 255, dtype=np.uint8)
+
+        for rect in self.exclude:
+            x1, y1, x2, y2 = self._to_pixels(rect, width, height)
+            mask[y1:y2, x1:x2] = 0
+
+        crops = []
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            # Non-rectangular zones (holes, mask shapes) are blanked outside the mask
+            needs_masking = cv2.countNonZero(mask[y:y + h, x:x + w]) < w * h
+            crops.append((x, y, x + w, y + h, needs_masking))
+
+        self._size = (width, height)
+        self._mask = mask
+        self._crops = sorted(crops, key=lambda c: (c[1], c[0]))
+
+    @staticmethod
+    def _to_pixels(rect, width, height):
+        x, y, w, h = rect
+        if max(x, y, w, h) <= 1:
+            x, w = x * width, w * width
+            y, h = y * height, h * height
+        x1, y1 = int(round(x)), int(round(y))
+        x2, y2 = int(round(x + w)), int(round(y + h))
+        return max(0, x1), max(0, y1), min(width, x2), min(height, y2)
+
+    def crops(self, frame):
+        """
+        Split a frame into the parts that should be OCR'd
+
+        Yields:
+            Tuples (x_offset, y_offset, crop) with crop coordinates relative to the offset
+        """
+        height, width = frame.shape[:2]
+        if self._size != (width, height):
+            self._prepare(width, height)
+
+        for x1, y1, x2, y2, needs_masking in self._crops:
+            crop = frame[y1:y2, x1:x2]
+            if needs_masking:
+                crop = cv2.bitwise_and(crop, crop, mask=self._mask[y1:y2, x1:x2])
+            yield x1, y1, crop
+
+    def allows(self, box):
+        """Check whether a detected (x1, y1, x2, y2, ...) box lies in a scanned zone"""
+        if self._mask is None:
+            return True
+        cx = min(int((box[0] + box[2]) // 2), self._size[0] - 1)
+        cy = min(int((box[1] + box[3]) // 2), self._size[1] - 1)
+        return bool(self._mask[cy, cx] > 0)
+
+    def coverage(self):
+        """Fraction of frame pixels sent to OCR (0-1), once a frame has been seen"""
+        if self._size is None:
+            return 1.0
+        scanned = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2, _ in self._crops)
+        return scanned / (self._size[0] * self._size[1])
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Streaming Video Text Blur
+Blurs text in a live stream read from stdin, a FIFO or an MPEG-TS pipe and
+writes fragmented MP4 or MPEG-TS incrementally, within a latency budget
+"""
+
+import argparse
+import contextlib
+import math
+import subprocess
+import sys
+import time
+
+from blur_text_video import add_processing_arguments, build_processor, processor_options
+from frame_pool import FramePool, FrameReader
+
+
+OUTPUT_FORMATS = ('mpegts', 'mp4')
+
+
+class PipeCapture:
+    """cv2.VideoCapture-style reader for raw BGR frames from an ffmpeg decoder process"""
+
+    def __init__(self, stream, width, height):
+        self.stream = stream
+        self.frame_size = width * height * 3
+
+    def read(self, buffer):
+        view = memoryview(buffer).cast('B')
+        filled = 0
+        while filled < self.frame_size:
+            n = self.stream.readinto(view[filled:])
+            if not n:
+                return False, None
+            filled += n
+        return True, buffer
+
+
+def open_decoder(source, width, height, input_format=None, fps=None):
+    """
+    Start an ffmpeg process decoding a stream to raw BGR frames of a fixed size
+
+    Args:
+        source: '-' for stdin, or a FIFO/file/URL path
+        width, height: Output frame size (the stream is scaled if needed)
+        input_format: Force the input format (e.g. 'mpegts', or 'rawvideo' for raw BGR frames)
+        fps: Input frame rate, required for rawvideo input
+    """
+    command = ['ffmpeg', '-v', 'error', '-fflags', 'nobuffer', '-flags', 'low_delay']
+    if input_format == 'rawvideo':
+        command += ['-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{width}x{height}',
+                    '-r', str(fps)]
+    elif input_format:
+        command += ['-f', input_format]
+    command += [
+        '-i', 'pipe:0' if source == '-' else str(source),
+        '-map', '0:v:0',
+        '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{width}x{height}',
+        'pipe:1'
+    ]
+    return subprocess.Popen(command, stdout=subprocess.PIPE)
+
+
+def open_encoder(output, width, height, fps, output_format='mpegts'):
+    """
+    Start a low-latency libx264 encoder writing MPEG-TS or fragmented MP4 incrementally
+
+    Args:
+        output: '-' for stdout, or a FIFO/file path
+        output_format: 'mpegts' or 'mp4' (fragmented, playable while being written)
+    """
+    command = [
+        'ffmpeg', '-v', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{width}x{height}', '-r', str(fps),
+        '-i', 'pipe:0',
+        '-c:v', 'libx264',
+        '-preset', 'veryfast',
+        '-tune', 'zerolatency',
+        '-g', str(max(1, int(round(fps)))),  # one keyframe per second bounds join/seek latency
+        '-pix_fmt', 'yuv420p'
+    ]
+    if output_format == 'mp4':
+        command += ['-f', 'mp4', '-movflags', 'frag_keyframe+empty_moov+default_base_moof']
+    else:
+        command += ['-f', 'mpegts']
+    command += ['-y', 'pipe:1' if output == '-' else str(output)]
+    return subprocess.Popen(command, stdin=subprocess.PIPE)
+
+
+def process_stream(processor, source, output, width, height, fps, input_format=None,
+                   output_format='mpegts', sample_rate=1, padding=10, latency_budget=0.5,
+                   max_sample_gap=None, drop_late=False, buffer_frames=4):
+    """
+    Blur text in a stream, relaxing OCR sampling whenever frames fall behind
+
+    A frame's latency is measured against the stream clock: how long after
+    its due time (the first frame's arrival plus frame_index / fps) it is
+    handed to the encoder. Frames waiting in the decoder or pipe count, so
+    a growing backlog shows up even if each frame is processed quickly
+    once read. When the source itself stalls (a frame arrives after its due
+    time while the reader was already waiting for it), the clock moves
+    forward with it, so the gap isn't counted as lag for the rest of the
+    stream. While latency exceeds latency_budget, the OCR interval doubles (up to
+    max_sample_gap frames, after which OCR is forced so text is never left
+    unblurred for long); once latency is back under half the budget it
+    halves again towards sample_rate. With drop_late, frames older than
+    twice the budget are dropped instead of encoded.
+
+    Args:
+        processor: VideoTextBlur instance
+        source: '-' for stdin, or a FIFO/file/URL path
+        output: '-' for stdout, or a FIFO/file path
+        width, height: Frame size to process at
+        fps: Stream frame rate
+        input_format: Force the input format (e.g. 'mpegts', 'rawvideo')
+        output_format: 'mpegts' or 'mp4'
+        sample_rate: Preferred OCR interval in frames
+        padding: Padding around detected text regions
+        latency_budget: Target end-to-end latency in seconds
+        max_sample_gap: Longest OCR interval allowed when behind (default: 1 second of frames)
+        drop_late: Drop frames that exceed twice the latency budget
+        buffer_frames: Minimum number of preallocated frame buffers
+
+    Returns:
+        Dict of streaming statistics
+    """
+    if max_sample_gap is None:
+        max_sample_gap = max(sample_rate, int(math.ceil(fps)))
+
+    decoder = open_decoder(source, width, height, input_format, fps)
+    encoder = open_encoder(output, width, height, fps, output_format)
+
+    # Enough buffers to absorb twice the budget, so lag shows up as latency instead of backpressure
+    pool_size = max(buffer_frames, int(math.ceil(2 * latency_budget * fps)) + 2)
+    pool = FramePool((height, width, 3), size=pool_size)
+    frame_reader = FrameReader(PipeCapture(decoder.stdout, width, height), pool)
+
+    processor.reader.reset()
+    stream_start = None  # Arrival time of the first frame; frame i is due at stream_start + i / fps
+    frame_index = -1
+    interval = sample_rate
+    since_ocr = max_sample_gap  # OCR the first frame
+    last_boxes = []
+    stats = {'frames': 0, 'ocr_frames': 0, 'relaxed': 0, 'dropped': 0, 'max_latency': 0.0}
+    latency_total = 0.0
+
+    try:
+        for frame in frame_reader:
+            frame_index += 1
+            if stream_start is None:
+                stream_start = frame_reader.last_arrival
+            due = stream_start + frame_index / fps
+            # Waiting on the source past the due time is an upstream stall, not lag: re-anchor.
+            # Frames we only got round to reading late (backlog in the pipe or pool) still count.
+            stall = frame_reader.last_arrival - max(frame_reader.last_requested, due)
+            if stall > 0:
+                stream_start += stall
+                due += stall
+            latency = time.monotonic() - due
+            behind = latency > latency_budget
+
+            if drop_late and latency > 2 * latency_budget:
+                stats['dropped'] += 1
+                frame_reader.release(frame)
+                continue
+
+            # At each OCR decision, back off while behind and recover once caught up
+            if since_ocr >= interval:
+                if behind and since_ocr < max_sample_gap:
+                    interval = min(interval * 2, max_sample_gap)
+                    stats['relaxed'] += 1
+                else:
+                    last_boxes = processor.scan_frame(frame)
+                    stats['ocr_frames'] += 1
+                    since_ocr = 0
+                    if latency < latency_budget / 2:
+                        interval = max(sample_rate, interval // 2)
+            since_ocr += 1
+
+            if last_boxes:
+                processor.blur_regions(frame, last_boxes, padding, in_place=True)
+
+            try:
+                encoder.stdin.write(memoryview(frame).cast('B'))
+                encoder.stdin.flush()
+            except BrokenPipeError:
+                print("Output closed, stopping stream", file=sys.stderr)
+                frame_reader.release(frame)
+                break
+            frame_reader.release(frame)
+
+            latency = max(0.0, time.monotonic() - due)
+            latency_total += latency
+            stats['max_latency'] = max(stats['max_latency'], latency)
+            stats['frames'] += 1
+    finally:
+        # Stop the decoder first so the reader thread's blocking read returns
+        decoder.terminate()
+        frame_reader.close()
+        with contextlib.suppress(BrokenPipeError):
+            encoder.stdin.close()
+        encoder.wait()
+        decoder.wait()
+
+    stats['mean_latency'] = latency_total / stats['frames'] if stats['frames'] else 0.0
+    return stats
+
+
+def parse_size(value):
+    """Parse a WIDTHxHEIGHT frame size"""
+    try:
+        width, height = (int(v) for v in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Size must be WIDTHxHEIGHT: {value}")
+    return width, height
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Blur specific words/text in a live video stream',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # MPEG-TS in on stdin, MPEG-TS out on stdout
+  ffmpeg -re -f lavfi -i testsrc=size=1280x720:rate=30 -f mpegts - | \\
+      python stream_blur.py - - --size 1280x720 --fps 30 --words "secret" > blurred.ts
+
+  # FIFO in, fragmented MP4 out, 300 ms budget
+  mkfifo feed.ts
+  python stream_blur.py feed.ts out.mp4 --size 1920x1080 --fps 25 --output-format mp4 \\
+      --latency-budget 0.3 --blur-all
+        """
+    )
+
+    parser.add_argument('source', help="Input stream: '-' for stdin, or a FIFO/file/URL")
+    parser.add_argument('output', help="Output stream: '-' for stdout, or a FIFO/file")
+    parser.add_argument('--size', type=parse_size, required=True,
+                        help='Frame size to process at, WIDTHxHEIGHT (input is scaled if needed)')
+    parser.add_argument('--fps', type=float, required=True, help='Stream frame rate')
+    parser.add_argument('--input-format', default=None,
+                        help="Force the input format, e.g. 'mpegts', "
+                             "or 'rawvideo' for raw BGR frames")
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, default='mpegts',
+                        help='Output container: mpegts or fragmented mp4 (default: mpegts)')
+    parser.add_argument('--latency-budget', type=float, default=0.5,
+                        help='Target end-to-end latency in seconds (default: 0.5)')
+    parser.add_argument('--drop-late', action='store_true',
+                        help='Drop frames older than twice the latency budget')
+    parser.add_argument('--words', nargs='*', default=None,
+                        help='Specific words/phrases to blur (case-insensitive)')
+    parser.add_argument('--blur-all', action='store_true',
+                        help='Blur ALL detected text (ignores --words)')
+    add_processing_arguments(parser)
+
+    args = parser.parse_args()
+
+    if not args.blur_all and not args.words:
+        parser.error('streaming mode is non-interactive: pass --words or --blur-all')
+    if args.partial_reencode:
+        parser.error('--partial-reencode needs a complete file and is not available for streams')
+    if args.target_speed:
+        parser.error('--target-speed does not apply to streams; use --latency-budget')
+
+    # Stdout may carry the video, so all messages go to stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            target_words = None if args.blur_all else args.words
+            processor = build_processor(processor_options(args, target_words))
+            width, height = args.size
+
+            print(f"\nStreaming {width}x{height} @ {args.fps} fps, "
+                  f"latency budget {args.latency_budget}s...")
+            stats = process_stream(
+                processor, args.source, args.output, width, height, args.fps,
+                input_format=args.input_format,
+                output_format=args.output_format,
+                sample_rate=args.sample_rate,
+                padding=args.padding,
+                latency_budget=args.latency_budget,
+                max_sample_gap=args.max_sample_gap,
+                drop_late=args.drop_late,
+                buffer_frames=args.buffer_frames
+            )
+
+            print(f"\n✓ Stream finished: {stats['frames']} frames, OCR on {stats['ocr_frames']}, "
+                  f"{stats['relaxed']} OCR samples relaxed, {stats['dropped']} dropped")
+            print(f"  Latency: mean {stats['mean_latency'] * 1000:.0f} ms, "
+                  f"max {stats['max_latency'] * 1000:.0f} ms")
+
+        except KeyboardInterrupt:
+            print("\n\nStream interrupted by user")
+            sys.exit(1)
+        except Exception as e:
+            print(f"\n❌ Error: {e}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
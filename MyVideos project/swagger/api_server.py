@@ -2,358 +2,879 @@
 """
 REST API Server for Video Text Blur Tool
 
-This Flask-based REST API provides endpoints for video text blurring operations.
+This ASGI (Starlette) REST API, served by uvicorn, provides endpoints for
+video text blurring operations. The event loop only does I/O: uploads and
+downloads are streamed without blocking it, and OCR/encoding runs in a pool
+of worker processes (see job_worker.py), so slow clients and status polls
+never wait on processing.
 See openapi.yaml for the complete API specification.
 """
 
 import os
+import re
 import uuid
-import json
+import base64
+import shutil
+import asyncio
 import mimetypes
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Optional
-from werkzeug.utils import secure_filename
-from flask import Flask, request, jsonify, send_file, render_template, send_from_directory
-from flask_cors import CORS
-import threading
+import math
 import sys
+import cv2
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import FileResponse, JSONResponse, Response
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
 
 # Add parent directory to path to import blur_text_video
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from blur_text_video import VideoTextBlur
-
-app = Flask(__name__,
-            static_folder='static',
-            template_folder='templates')
-CORS(app)  # Enable CORS for all routes
+from ocr_backends import BACKENDS
+from scan_regions import parse_rect
+from throughput_governor import parse_speed
+from storage_manager import StorageManager, InsufficientStorage
+import job_worker
+from job_worker import OCR_BACKEND_OPTIONS
 
 # Configuration
+BASE_DIR = Path(__file__).parent
 UPLOAD_FOLDER = Path('uploads')
 OUTPUT_FOLDER = Path('outputs')
 ALLOWED_EXTENSIONS = {'mp4', 'mov'}
+ALLOWED_MASK_EXTENSIONS = {'png', 'jpg', 'jpeg', 'bmp'}
+DEFAULT_ESTIMATED_DURATION = 120  # Seconds, when no target_speed is requested
 MAX_FILE_SIZE = 500 * 1024 * 1024  # 500MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Bytes copied per read when saving uploads
+DEFAULT_PREVIEW_FRAMES = 8
+JOB_SPACE_FACTOR = 3  # Upload + temporary encode + result, in multiples of the upload size
+STORAGE_BUDGET_BYTES = int(os.environ.get('STORAGE_BUDGET_BYTES', 20 * 1024**3))  # 20GB
+MIN_FREE_BYTES = int(os.environ.get('MIN_FREE_BYTES', 1024**3))  # Always leave 1GB free on disk
+MAX_PREVIEW_FRAMES = 32
+PROCESSING_WORKERS = int(os.environ.get('PROCESSING_WORKERS', 2))  # Videos processed at once
+# Separate from processing, so previews never queue behind jobs
+PREVIEW_WORKERS = int(os.environ.get('PREVIEW_WORKERS', 1))
 API_KEY = os.environ.get('API_KEY', None)  # Optional API key from environment
 
 # Create directories
 UPLOAD_FOLDER.mkdir(exist_ok=True)
 OUTPUT_FOLDER.mkdir(exist_ok=True)
 
-# In-memory job storage with thread safety (use Redis/database in production)
+# Byte budget for uploads and results; files left by a previous run are evicted first
+storage = StorageManager([UPLOAD_FOLDER, OUTPUT_FOLDER], STORAGE_BUDGET_BYTES, MIN_FREE_BYTES)
+
+# In-memory job storage (use Redis/database in production). Only the event loop
+# reads or writes these, so status requests never wait on a lock held by a worker.
 jobs: Dict[str, Dict] = {}
-jobs_lock = threading.Lock()  # FIX 1: Thread-safe access to jobs dictionary
+previews: Dict[str, Dict] = {}  # Uploads kept for previews and promotion to full jobs
 JOB_RETENTION_HOURS = 24  # FIX 5: Keep jobs for 24 hours
 
+# Worker processes for CPU-heavy work, started with the server (see lifespan)
+POOL_SIZES = {'processing': PROCESSING_WORKERS, 'preview': PREVIEW_WORKERS}
+worker_pools: Dict[str, ProcessPoolExecutor] = {}
+# A job is 'processing' once it holds a slot
+processing_slots = asyncio.Semaphore(PROCESSING_WORKERS)
+background_tasks = set()  # Keep references to running job tasks
+
 
 def allowed_file(filename: str) -> bool:
     """Check if file extension is allowed."""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-def cleanup_old_jobs():
+def secure_filename(filename: str) -> str:
+    """Reduce a client-supplied filename to a safe basename (letters, digits, '-', '_', '.')."""
+    filename = os.path.basename(filename.replace('\\', '/'))
+    filename = re.sub(r'[^A-Za-z0-9_.-]', '_', filename).strip('._')
+    return filename or 'upload'
+
+
+def error_response(error: str, message: str, status_code: int) -> JSONResponse:
+    """Build the JSON error body used by every endpoint."""
+    return JSONResponse({'error': error, 'message': message}, status_code=status_code)
+
+
+def file_too_large() -> JSONResponse:
+    """Handle file too large error."""
+    return error_response(
+        'FILE_TOO_LARGE',
+        f'File size exceeds maximum limit of {MAX_FILE_SIZE // (1024*1024)}MB',
+        413
+    )
+
+
+def estimate_duration(input_path: Path, target_speed: Optional[float]) -> int:
+    """Estimate processing time in seconds: video duration / target_speed when governed."""
+    if not target_speed:
+        return DEFAULT_ESTIMATED_DURATION
+    cap = cv2.VideoCapture(str(input_path))
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+    finally:
+        cap.release()
+    if not fps or not frames:
+        return DEFAULT_ESTIMATED_DURATION
+    return int(math.ceil(frames / fps / target_speed))
+
+
+def parse_parameters(form, defaults: Optional[Dict] = None) -> Dict:
+    """
+    Parse processing parameters from a multipart form (raises ValueError/TypeError).
+
+    Fields missing from the form take their value from defaults (the approved
+    parameters of a preview being promoted), then from the API defaults.
+    """
+    params = {
+        'languages': form.getlist('languages') or ['en'],
+        'blur_strength': int(form.get('blur_strength', 51)),
+        'confidence': float(form.get('confidence', 0.5)),
+        'sample_rate': int(form.get('sample_rate', 1)),
+        'padding': int(form.get('padding', 10)),
+        'words': form.getlist('words') or None,
+        'ocr_backend': form.get('ocr_backend', 'easyocr'),
+        'prefilter': form.get('prefilter', 'false').lower() == 'true',
+        'prefilter_candidates': int(form.get('prefilter_candidates', 3)),
+        'prefilter_contrast': int(form.get('prefilter_contrast', 32)),
+        'roi': form.getlist('roi') or None,
+        'exclude': form.getlist('exclude') or None,
+        'partial_reencode': form.get('partial_reencode', 'false').lower() == 'true',
+        'target_speed': parse_speed(form['target_speed']) if form.get('target_speed') else None,
+        'max_sample_gap': int(form['max_sample_gap']) if form.get('max_sample_gap') else None
+    }
+    if defaults:
+        params.update({name: value for name, value in defaults.items()
+                       if name in params and name not in form})
+    return params
+
+
+def validate_parameters(params: Dict, mask_file) -> list:
+    """FIX 4: Validate parameter ranges. Returns a list of error messages."""
+    validation_errors = []
+    if params['blur_strength'] <= 0:
+        validation_errors.append('blur_strength must be positive')
+    if params['blur_strength'] % 2 == 0:
+        validation_errors.append('blur_strength must be an odd number')
+    if not (0.0 <= params['confidence'] <= 1.0):
+        validation_errors.append('confidence must be between 0.0 and 1.0')
+    if params['sample_rate'] < 1:
+        validation_errors.append('sample_rate must be at least 1')
+    if params['padding'] < 0:
+        validation_errors.append('padding must be non-negative')
+    if params['prefilter_candidates'] < 1:
+        validation_errors.append('prefilter_candidates must be at least 1')
+    if not (1 <= params['prefilter_contrast'] <= 255):
+        validation_errors.append('prefilter_contrast must be between 1 and 255')
+    if params['ocr_backend'] not in BACKENDS:
+        validation_errors.append(f'ocr_backend must be one of: {", ".join(BACKENDS)}')
+    elif params['ocr_backend'] == 'opencv' and not OCR_BACKEND_OPTIONS['detector_model']:
+        validation_errors.append(
+            'ocr_backend opencv is not available (OCR_DETECTOR_MODEL not configured)'
+        )
+    if params['partial_reencode'] and params['target_speed']:
+        validation_errors.append('target_speed is not available with partial_reencode')
+    if params['max_sample_gap'] is not None and params['max_sample_gap'] < params['sample_rate']:
+        validation_errors.append('max_sample_gap must be at least sample_rate')
+    for rect in (params['roi'] or []) + (params['exclude'] or []):
+        try:
+            parse_rect(rect)
+        except ValueError as e:
+            validation_errors.append(str(e))
+    if mask_file and mask_file.filename:
+        if '.' not in mask_file.filename or \
+                mask_file.filename.rsplit('.', 1)[1].lower() not in ALLOWED_MASK_EXTENSIONS:
+            validation_errors.append(
+                f'roi_mask must be one of: {", ".join(sorted(ALLOWED_MASK_EXTENSIONS))}'
+            )
+    return validation_errors
+
+
+def uploaded_file(form, name: str) -> Optional[UploadFile]:
+    """Return a form field if it is a file upload."""
+    value = form.get(name)
+    return value if isinstance(value, UploadFile) else None
+
+
+def copy_upload(source, destination: Path) -> int:
+    """Copy a spooled upload to its destination (blocking; run on a worker thread).
+
+    Returns its size.
+    """
+    source.seek(0)
+    with open(destination, 'wb') as out:
+        shutil.copyfileobj(source, out, UPLOAD_CHUNK_SIZE)
+    return destination.stat().st_size
+
+
+async def save_video_upload(file: UploadFile, upload_id: str, kind: str = 'input'):
+    """
+    Validate and save an uploaded video, tracking it in storage as kind ('input' or 'preview').
+
+    Returns:
+        Tuple (input_path, filename, error_response); error_response is None on success
+    """
+    # Check if file is selected
+    if not file.filename:
+        return None, None, error_response('EMPTY_FILENAME', 'No file selected', 400)
+
+    # Check file extension
+    if not allowed_file(file.filename):
+        return None, None, error_response(
+            'INVALID_FORMAT', f'Only {", ".join(ALLOWED_EXTENSIONS)} files are supported', 415
+        )
+
+    # Save uploaded file with error handling
+    filename = secure_filename(file.filename)
+    input_path = UPLOAD_FOLDER / f"{upload_id}_{filename}"
+
+    try:
+        # Copy on a worker thread so the event loop keeps serving other requests
+        file_size = await run_in_threadpool(copy_upload, file.file, input_path)
+
+        # Validate file size after saving
+        if file_size > MAX_FILE_SIZE:
+            await discard_files(input_path)
+            return None, None, file_too_large()
+    except Exception as e:
+        await discard_files(input_path)
+        return None, None, error_response(
+            'FILE_SAVE_ERROR', f'Failed to save uploaded file: {str(e)}', 500
+        )
+
+    storage.add(input_path, kind, owner=upload_id)
+    return input_path, filename, None
+
+
+async def save_roi_mask(mask_file: UploadFile, owner_id: str) -> Path:
+    """Save an uploaded ROI mask image next to the upload it belongs to."""
+    mask_extension = mask_file.filename.rsplit('.', 1)[1].lower()
+    mask_path = UPLOAD_FOLDER / f"{owner_id}_roi_mask.{mask_extension}"
+    await run_in_threadpool(copy_upload, mask_file.file, mask_path)
+    storage.add(mask_path, 'mask', owner=owner_id)
+    return mask_path
+
+
+def remove_files(*paths):
+    """Delete files that exist, ignoring empty entries, and stop counting them against storage."""
+    for path in paths:
+        if path and Path(path).exists():
+            Path(path).unlink()
+        if path:
+            storage.discard(path)
+
+
+async def discard_files(*paths):
+    """remove_files() on a worker thread, so the event loop never waits on the disk."""
+    await run_in_threadpool(remove_files, *paths)
+
+
+def job_mask(job: Dict) -> Optional[str]:
+    """The ROI mask a job owns.
+
+    A job promoted from a preview reuses the preview's mask unless it sent its own.
+    """
+    return job.get('mask_path') if job.get('mask_owned', not job.get('preview_id')) else None
+
+
+def remove_job_files(job: Dict):
+    """Delete a job's files. Inputs of jobs promoted from a preview belong to the preview."""
+    if job.get('preview_id'):
+        remove_files(job['output_path'], job_mask(job))
+    else:
+        remove_files(job['input_path'], job['output_path'], job_mask(job))
+
+
+async def reserve_space(owner: str, nbytes: int) -> Optional[JSONResponse]:
+    """
+    Reserve storage for an upload or job, evicting old results if needed.
+
+    Returns:
+        Error response if there isn't enough space, otherwise None
+    """
+    try:
+        # Eviction deletes files, so it runs off the event loop
+        evicted = await run_in_threadpool(storage.reserve, owner, nbytes)
+        space_error = None
+    except InsufficientStorage as e:
+        evicted = e.evicted
+        space_error = error_response(
+            'INSUFFICIENT_STORAGE', f'{str(e)}. Try again later or delete finished jobs.', 507
+        )
+
+    # Update the records of anything that was evicted to make room
+    evicted_masks = []
+    for entry in evicted:
+        if entry['kind'] == 'output' and entry['owner'] in jobs:
+            jobs[entry['owner']]['result_evicted'] = True
+            jobs[entry['owner']].pop('result_url', None)
+        elif entry['kind'] == 'preview' and entry['owner'] in previews:
+            evicted_masks.append(previews.pop(entry['owner']).get('mask_path'))
+    await discard_files(*evicted_masks)
+    return space_error
+
+
+def content_length(request: Request) -> Optional[int]:
+    """Request body size from the Content-Length header, if sent."""
+    try:
+        return int(request.headers['content-length'])
+    except (KeyError, ValueError):
+        return None
+
+
+class BodyTooLarge(Exception):
+    """Raised while reading a request body that grows past MAX_FILE_SIZE."""
+
+
+def limit_body(request: Request) -> Request:
+    """
+    The same request, with its body counted as it streams in.
+
+    Content-Length is optional (chunked uploads don't send it), so the body is
+    checked as it arrives and reading stops with BodyTooLarge once it passes
+    MAX_FILE_SIZE, before the rest is spooled to disk.
+    """
+    received = 0
+
+    async def receive():
+        nonlocal received
+        message = await request.receive()
+        if message['type'] == 'http.request':
+            received += len(message.get('body', b''))
+            if received > MAX_FILE_SIZE:
+                raise BodyTooLarge()
+        return message
+
+    return Request(request.scope, receive)
+
+
+def upload_reservation(request: Request) -> int:
+    """Bytes a request body can occupy on disk, known from Content-Length before it is read."""
+    return min(content_length(request) or MAX_FILE_SIZE, MAX_FILE_SIZE)
+
+
+def preview_in_use(preview_id: str) -> bool:
+    """Check whether a queued or running job reads a preview's upload."""
+    return any(job.get('preview_id') == preview_id and job['status'] in ('queued', 'processing')
+               for job in jobs.values())
+
+
+async def cleanup_old_jobs():
     """Remove jobs and files older than retention period. FIX 5: Prevent memory/disk leaks."""
     while True:
         try:
             current_time = datetime.utcnow()
-            with jobs_lock:
-                jobs_to_delete = []
-                
-                for job_id, job in jobs.items():
-                    try:
-                        # Parse created_at timestamp (handle 'Z' suffix properly)
-                        created_at_str = job['created_at'].rstrip('Z')
-                        created_at = datetime.fromisoformat(created_at_str)
-                        age = current_time - created_at
-                        
-                        # Delete jobs older than retention period
-                        if age > timedelta(hours=JOB_RETENTION_HOURS):
-                            jobs_to_delete.append(job_id)
-                    except (ValueError, KeyError) as e:
-                        print(f"Error parsing timestamp for job {job_id}: {e}")
-                        continue
-                
-                # Clean up old jobs
-                for job_id in jobs_to_delete:
-                    job = jobs[job_id]
-                    try:
-                        # Remove files
-                        input_path = Path(job['input_path'])
-                        if input_path.exists():
-                            input_path.unlink()
-                        output_path = Path(job['output_path'])
-                        if output_path.exists():
-                            output_path.unlink()
-                    except Exception as e:
-                        print(f"Error cleaning up files for job {job_id}: {e}")
-                    
-                    # Remove from jobs dict
-                    del jobs[job_id]
-                    print(f"Cleaned up old job: {job_id}")
-        
+            jobs_to_delete = []
+
+            for job_id, job in jobs.items():
+                try:
+                    # Parse created_at timestamp (handle 'Z' suffix properly)
+                    created_at_str = job['created_at'].rstrip('Z')
+                    created_at = datetime.fromisoformat(created_at_str)
+                    age = current_time - created_at
+
+                    # Delete jobs older than retention period
+                    if age > timedelta(hours=JOB_RETENTION_HOURS):
+                        jobs_to_delete.append(job_id)
+                except (ValueError, KeyError) as e:
+                    print(f"Error parsing timestamp for job {job_id}: {e}")
+                    continue
+
+            # Clean up old jobs (records first, so no request sees a job without files)
+            for job_id in jobs_to_delete:
+                job = jobs.pop(job_id)
+                try:
+                    await run_in_threadpool(remove_job_files, job)
+                except Exception as e:
+                    print(f"Error cleaning up files for job {job_id}: {e}")
+                print(f"Cleaned up old job: {job_id}")
+
+            # Clean up old previews whose uploads no running job still needs
+            for preview_id, preview in list(previews.items()):
+                created_at = datetime.fromisoformat(preview['created_at'].rstrip('Z'))
+                if current_time - created_at <= timedelta(hours=JOB_RETENTION_HOURS) or \
+                        preview_in_use(preview_id):
+                    continue
+                del previews[preview_id]
+                try:
+                    await discard_files(preview['input_path'], preview.get('mask_path'))
+                except Exception as e:
+                    print(f"Error cleaning up files for preview {preview_id}: {e}")
+                print(f"Cleaned up old preview: {preview_id}")
+
         except Exception as e:
-            print(f"Error in cleanup thread: {e}")
-        
+            print(f"Error in cleanup task: {e}")
+
         # Run cleanup every hour
-        threading.Event().wait(3600)
+        await asyncio.sleep(3600)
+
+
+def start_worker_pool(name: str):
+    """Start (or restart) a pool of spawned worker processes."""
+    # Spawned workers don't inherit the server's event loop or threads
+    worker_pools[name] = ProcessPoolExecutor(
+        POOL_SIZES[name],
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=job_worker.init_worker
+    )
 
 
-def process_video_async(job_id: str, input_path: str, output_path: str, params: Dict):
-    """Process video in background thread. FIX 1: Thread-safe job updates."""
+async def run_in_worker(name: str, func, *args):
+    """
+    Run func in a worker pool, replacing the pool if a worker dies.
+
+    A worker killed mid-task (out of memory, segfault) breaks its whole pool, so
+    every later submission would fail too. The broken pool is replaced and only
+    the tasks it was running fail; later tasks run in the new pool.
+    """
+    loop = asyncio.get_running_loop()
+    pool = worker_pools[name]
+    try:
+        future = loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # Broken by another task that hasn't been told yet; this one never started
+        if worker_pools[name] is pool:
+            start_worker_pool(name)
+        pool = worker_pools[name]
+        future = loop.run_in_executor(pool, func, *args)
     try:
-        # FIX 1: Use lock when updating shared job state, check if job still exists
-        with jobs_lock:
+        return await future
+    except BrokenProcessPool:
+        if worker_pools[name] is pool:
+            print(f"⚠ A {name} worker exited unexpectedly, restarting the pool")
+            start_worker_pool(name)
+            pool.shutdown(wait=False, cancel_futures=True)
+        raise RuntimeError(
+            'Worker process exited unexpectedly (out of memory or crashed)'
+        ) from None
+
+
+async def process_video_async(job_id: str, input_path: str, output_path: str, params: Dict):
+    """Process video in a worker process once a processing slot is free."""
+    mask_path = None
+    owned_mask = None
+    preview_id = None
+    try:
+        async with processing_slots:
+            # Check if job still exists
             if job_id not in jobs:
                 print(f"Job {job_id} was deleted before processing started")
                 return
             jobs[job_id]['status'] = 'processing'
             jobs[job_id]['started_at'] = datetime.utcnow().isoformat() + 'Z'
-        
-        # Initialize blur processor
-        blur = VideoTextBlur(
-            languages=params.get('languages', ['en']),
-            blur_strength=params.get('blur_strength', 51),
-            confidence_threshold=params.get('confidence', 0.5),
-            target_words=params.get('words', None)
-        )
-        
-        # Process video with sample_rate and padding parameters
-        blur.process_video(
-            input_path,
-            output_path,
-            sample_rate=params.get('sample_rate', 1),
-            padding=params.get('padding', 10)
-        )
-        
-        # FIX 1: Update job status with lock protection, check if job still exists
-        with jobs_lock:
-            if job_id not in jobs:
-                print(f"Job {job_id} was deleted during processing")
-                return
-            jobs[job_id]['status'] = 'completed'
-            jobs[job_id]['completed_at'] = datetime.utcnow().isoformat() + 'Z'
-            jobs[job_id]['progress'] = 100
-            jobs[job_id]['result_url'] = f'/api/v1/jobs/{job_id}/result'
-        
+            mask_path = jobs[job_id].get('mask_path')
+            owned_mask = job_mask(jobs[job_id])
+            preview_id = jobs[job_id].get('preview_id')
+
+            # OCR and encoding run in a worker process, off the event loop
+            await run_in_worker(
+                'processing', job_worker.process_job, input_path, output_path, params, mask_path
+            )
+
+        if job_id not in jobs:
+            print(f"Job {job_id} was deleted during processing")
+            await discard_files(output_path)
+            return
+        storage.add(output_path, 'output', owner=job_id)
+        jobs[job_id]['status'] = 'completed'
+        jobs[job_id]['completed_at'] = datetime.utcnow().isoformat() + 'Z'
+        jobs[job_id]['progress'] = 100
+        jobs[job_id]['result_url'] = f'/api/v1/jobs/{job_id}/result'
+
     except Exception as e:
-        # FIX 1: Update error status with lock protection, check if job still exists
-        with jobs_lock:
-            if job_id not in jobs:
-                print(f"Job {job_id} was deleted before error could be recorded")
-                return
-            jobs[job_id]['status'] = 'failed'
-            jobs[job_id]['error'] = str(e)
-            jobs[job_id]['completed_at'] = datetime.utcnow().isoformat() + 'Z'
+        await discard_files(output_path)  # Drop any partial result
+
+        # Check if job still exists before recording the error
+        if job_id not in jobs:
+            print(f"Job {job_id} was deleted before error could be recorded")
+            return
+        jobs[job_id]['status'] = 'failed'
+        jobs[job_id]['error'] = str(e)
+        jobs[job_id]['completed_at'] = datetime.utcnow().isoformat() + 'Z'
 
-def check_api_key():
+    finally:
+        # Inputs are only kept for re-rendering when they belong to a preview
+        if preview_id:
+            storage.unpin(input_path)
+            await discard_files(owned_mask)
+        else:
+            await discard_files(input_path, owned_mask)
+        await discard_files(Path(output_path).with_suffix('.temp.mp4'))
+        storage.release(job_id)
+
+
+def start_job(job_id: str, input_path: str, output_path: str, params: Dict):
+    """Schedule a job on the event loop; it waits for a processing slot."""
+    task = asyncio.create_task(process_video_async(job_id, input_path, output_path, params))
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+
+def check_api_key(request: Request) -> Optional[JSONResponse]:
     """Validate API key if configured."""
     if API_KEY:
         provided_key = request.headers.get('X-API-Key')
         if not provided_key or provided_key != API_KEY:
-            return jsonify({
-                'error': 'UNAUTHORIZED',
-                'message': 'Invalid or missing API key'
-            }), 401
+            return error_response('UNAUTHORIZED', 'Invalid or missing API key', 401)
     return None
 
 
-@app.route('/')
-def index():
+async def index(request: Request):
     """Serve the web interface."""
-    return render_template('index.html')
+    return FileResponse(BASE_DIR / 'templates' / 'index.html', media_type='text/html')
 
 
-@app.route('/static/<path:filename>')
-def serve_static(filename):
-    """Serve static files."""
-    return send_from_directory('static', filename)
-
-
-@app.route('/swagger')
-def swagger_ui():
+async def swagger_ui(request: Request):
     """Redirect to Swagger UI or API documentation."""
-    return jsonify({
+    return JSONResponse({
         'message': 'API Documentation',
         'openapi_spec': '/api/v1/openapi.yaml',
         'endpoints': {
             'health': '/api/v1/health',
             'blur_video': '/api/v1/videos/blur',
+            'preview_video': '/api/v1/videos/preview',
+            'delete_preview': '/api/v1/previews/{previewId}',
             'job_status': '/api/v1/jobs/{jobId}',
             'download_result': '/api/v1/jobs/{jobId}/result'
         }
     })
 
 
-@app.route('/api/v1/openapi.yaml')
-def openapi_spec():
+async def openapi_spec(request: Request):
     """Serve OpenAPI specification."""
-    spec_path = Path(__file__).parent / 'openapi.yaml'
+    spec_path = BASE_DIR / 'openapi.yaml'
     if spec_path.exists():
-        return send_file(str(spec_path), mimetype='text/yaml')
-    return jsonify({'error': 'OpenAPI spec not found'}), 404
+        return FileResponse(spec_path, media_type='text/yaml')
+    return JSONResponse({'error': 'OpenAPI spec not found'}, status_code=404)
 
 
-@app.route('/api/v1/health', methods=['GET'])
-def health_check():
+async def health_check(request: Request):
     """Health check endpoint."""
-    return jsonify({
+    return JSONResponse({
         'status': 'healthy',
         'version': '1.0.0',
         'timestamp': datetime.utcnow().isoformat() + 'Z'
     })
 
 
-@app.route('/api/v1/videos/blur', methods=['POST'])
-def blur_video():
-    """Submit video for text blurring."""
+async def blur_video(request: Request):
+    """Submit video for text blurring, or promote a preview's upload to a full job."""
     # Check API key if configured
-    auth_error = check_api_key()
+    auth_error = check_api_key(request)
     if auth_error:
         return auth_error
-    
-    # Check if video file is present
-    if 'video' not in request.files:
-        return jsonify({
-            'error': 'MISSING_FILE',
-            'message': 'Video file is required'
-        }), 400
-    
-    file = request.files['video']
-    
-    # Check if file is selected
-    if file.filename == '':
-        return jsonify({
-            'error': 'EMPTY_FILENAME',
-            'message': 'No file selected'
-        }), 400
-    
-    # Check file extension
-    if not allowed_file(file.filename):
-        return jsonify({
-            'error': 'INVALID_FORMAT',
-            'message': f'Only {", ".join(ALLOWED_EXTENSIONS)} files are supported'
-        }), 415
-    
+
+    # Reject oversized uploads before reading the body
+    if (content_length(request) or 0) > MAX_FILE_SIZE:
+        return file_too_large()
+
     # Generate job ID
     job_id = str(uuid.uuid4())
-    
-    # Save uploaded file with error handling
-    filename = secure_filename(file.filename)
-    input_path = UPLOAD_FOLDER / f"{job_id}_{filename}"
-    
+
+    # Reject before the body is read if the upload, its temporary encode and result can't fit
+    space_error = await reserve_space(job_id, upload_reservation(request) * JOB_SPACE_FACTOR)
+    if space_error:
+        return space_error
+
+    accepted = False
     try:
-        file.save(str(input_path))
-        
-        # Validate file size after saving
-        file_size = input_path.stat().st_size
-        if file_size > MAX_FILE_SIZE:
-            input_path.unlink()  # Delete the file
-            return jsonify({
-                'error': 'FILE_TOO_LARGE',
-                'message': f'File size exceeds maximum limit of {MAX_FILE_SIZE // (1024*1024)}MB'
-            }), 413
-    except Exception as e:
-        if input_path.exists():
-            input_path.unlink()
-        return jsonify({
-            'error': 'FILE_SAVE_ERROR',
-            'message': f'Failed to save uploaded file: {str(e)}'
-        }), 500
-    
+        # The body streams into a spooled file without blocking the event loop
+        async with limit_body(request).form() as form:
+            response = await submit_blur_job(job_id, form)
+        accepted = response.status_code == 202
+        return response
+    except BodyTooLarge:
+        return file_too_large()
+    finally:
+        # An accepted job keeps its reservation until processing finishes
+        if not accepted:
+            storage.release(job_id)
+
+
+async def submit_blur_job(job_id: str, form) -> JSONResponse:
+    """Validate a blur request and start its job. Storage for job_id is already reserved."""
+    preview_id = form.get('preview_id')
+    preview = None
+    if preview_id:
+        # Reuse the file uploaded for the preview instead of a second upload
+        preview = dict(previews.get(preview_id, {}))
+        if not preview or not Path(preview['input_path']).exists():
+            return error_response('PREVIEW_NOT_FOUND', f'Preview {preview_id} not found', 404)
+        input_path = Path(preview['input_path'])
+        filename = preview['input_file']
+    else:
+        # Check if video file is present
+        video = uploaded_file(form, 'video')
+        if video is None:
+            return error_response('MISSING_FILE', 'Video file or preview_id is required', 400)
+
+        input_path, filename, upload_error = await save_video_upload(video, job_id)
+        if upload_error:
+            return upload_error
+
+    async def discard_upload():
+        # Preview uploads stay with the preview
+        if not preview:
+            await discard_files(input_path)
+
     # Prepare output path
     output_filename = f"{job_id}_blurred_{filename}"
     output_path = OUTPUT_FOLDER / output_filename
-    
-    # FIX 2: Parse parameters with validation
+
+    # FIX 2: Parse parameters with validation (a promoted preview's settings are the defaults)
     try:
-        params = {
-            'languages': request.form.getlist('languages') or ['en'],
-            'blur_strength': int(request.form.get('blur_strength', 51)),
-            'confidence': float(request.form.get('confidence', 0.5)),
-            'sample_rate': int(request.form.get('sample_rate', 1)),
-            'padding': int(request.form.get('padding', 10)),
-            'words': request.form.getlist('words') or None
-        }
+        params = parse_parameters(form, preview['parameters'] if preview else None)
     except (ValueError, TypeError) as e:
         # Clean up uploaded file if parameter parsing fails
-        if input_path.exists():
-            input_path.unlink()
-        return jsonify({
-            'error': 'INVALID_PARAMETER',
-            'message': f'Invalid parameter value: {str(e)}'
-        }), 400
-    
+        await discard_upload()
+        return error_response('INVALID_PARAMETER', f'Invalid parameter value: {str(e)}', 400)
+
     # FIX 4: Validate parameter ranges
-    validation_errors = []
-    if params['blur_strength'] <= 0:
-        validation_errors.append('blur_strength must be positive')
-    if params['blur_strength'] % 2 == 0:
-        validation_errors.append('blur_strength must be an odd number')
-    if not (0.0 <= params['confidence'] <= 1.0):
-        validation_errors.append('confidence must be between 0.0 and 1.0')
-    if params['sample_rate'] < 1:
-        validation_errors.append('sample_rate must be at least 1')
-    if params['padding'] < 0:
-        validation_errors.append('padding must be non-negative')
-    
+    mask_file = uploaded_file(form, 'roi_mask')
+    validation_errors = validate_parameters(params, mask_file)
+
     if validation_errors:
-        if input_path.exists():
-            input_path.unlink()
-        return jsonify({
-            'error': 'INVALID_PARAMETER',
-            'message': '; '.join(validation_errors)
-        }), 400
-    
-    # Create job record with thread safety
-    created_at = datetime.utcnow().isoformat() + 'Z'
-    with jobs_lock:
-        jobs[job_id] = {
-            'job_id': job_id,
-            'status': 'queued',
-            'created_at': created_at,
-            'input_file': filename,
-            'output_file': output_filename,
-            'input_path': str(input_path),
-            'output_path': str(output_path),
-            'parameters': params,
-            'progress': 0
-        }
-    
-    # Start processing in background thread
-    thread = threading.Thread(
-        target=process_video_async,
-        args=(job_id, str(input_path), str(output_path), params)
+        await discard_upload()
+        return error_response('INVALID_PARAMETER', '; '.join(validation_errors), 400)
+
+    # Save the ROI mask image under the job. A promoted preview's mask is shared with
+    # its other jobs, so it is reused as is and never replaced from here.
+    mask_path = Path(preview['mask_path']) if preview and preview.get('mask_path') else None
+    mask_owned = False
+    if mask_file and mask_file.filename:
+        try:
+            mask_path = await save_roi_mask(mask_file, job_id)
+        except Exception as e:
+            await discard_upload()
+            return error_response('FILE_SAVE_ERROR', f'Failed to save ROI mask: {str(e)}', 500)
+        mask_owned = True
+        params['roi_mask'] = secure_filename(mask_file.filename)
+    elif preview and mask_path:
+        params['roi_mask'] = preview['parameters'].get('roi_mask')
+
+    if preview:
+        # The upload already exists; only the temporary encode and result need room
+        storage.pin(input_path)
+        job_bytes = input_path.stat().st_size * (JOB_SPACE_FACTOR - 1)
+        space_error = await reserve_space(job_id, job_bytes)
+        if space_error:
+            storage.unpin(input_path)
+            if mask_owned:
+                await discard_files(mask_path)
+            return space_error
+
+    estimated_duration = await run_in_threadpool(
+        estimate_duration, input_path, params['target_speed']
     )
-    thread.daemon = True
-    thread.start()
-    
-    return jsonify({
+
+    # Create job record
+    created_at = datetime.utcnow().isoformat() + 'Z'
+    jobs[job_id] = {
+        'job_id': job_id,
+        'status': 'queued',
+        'created_at': created_at,
+        'input_file': filename,
+        'output_file': output_filename,
+        'input_path': str(input_path),
+        'output_path': str(output_path),
+        'mask_path': str(mask_path) if mask_path else None,
+        'mask_owned': mask_owned,
+        'preview_id': preview_id if preview else None,
+        'parameters': params,
+        'progress': 0
+    }
+
+    # Start processing once a worker is free
+    start_job(job_id, str(input_path), str(output_path), params)
+
+    return JSONResponse({
         'job_id': job_id,
         'status': 'queued',
         'created_at': created_at,
-        'estimated_duration': 120  # Placeholder
-    }), 202
+        'estimated_duration': estimated_duration
+    }, status_code=202)
 
 
-@app.route('/api/v1/jobs/<job_id>', methods=['GET'])
-def get_job_status(job_id: str):
-    """Get job status. FIX 6: Thread-safe job access."""
+async def preview_video(request: Request):
+    """Dry run: OCR a few evenly spaced frames and return detections with annotated thumbnails."""
     # Check API key if configured
-    auth_error = check_api_key()
+    auth_error = check_api_key(request)
     if auth_error:
         return auth_error
-    
-    # FIX 6: Thread-safe job access
-    with jobs_lock:
-        if job_id not in jobs:
-            return jsonify({
-                'error': 'JOB_NOT_FOUND',
-                'message': f'Job {job_id} not found'
-            }), 404
-        
-        # Create a copy to avoid holding lock during response building
-        job = jobs[job_id].copy()
-    
-    # Build response (outside lock)
+
+    # Reject oversized uploads before reading the body
+    if (content_length(request) or 0) > MAX_FILE_SIZE:
+        return file_too_large()
+
+    # Reject before the body is read if the upload can't fit
+    upload_id = str(uuid.uuid4())
+    space_error = await reserve_space(upload_id, upload_reservation(request))
+    if space_error:
+        return space_error
+
+    try:
+        async with limit_body(request).form() as form:
+            return await run_preview(upload_id, form)
+    except BodyTooLarge:
+        return file_too_large()
+    finally:
+        # The upload is tracked by now and nothing else is written
+        storage.release(upload_id)
+
+
+async def run_preview(upload_id: str, form) -> JSONResponse:
+    """Validate a preview request and OCR the sampled frames (storage for upload_id is reserved)."""
+    # Re-preview an earlier upload with new parameters, or start from a new upload
+    preview_id = form.get('preview_id')
+    existing = None
+    if preview_id:
+        existing = dict(previews.get(preview_id, {}))
+        if not existing or not Path(existing['input_path']).exists():
+            return error_response('PREVIEW_NOT_FOUND', f'Preview {preview_id} not found', 404)
+        input_path = Path(existing['input_path'])
+        filename = existing['input_file']
+    else:
+        video = uploaded_file(form, 'video')
+        if video is None:
+            return error_response('MISSING_FILE', 'Video file or preview_id is required', 400)
+
+        preview_id = upload_id
+        input_path, filename, upload_error = await save_video_upload(video, preview_id, 'preview')
+        if upload_error:
+            return upload_error
+
+    async def discard_upload():
+        if not existing:
+            await discard_files(input_path)
+
+    try:
+        params = parse_parameters(form)
+        frame_count = int(form.get('frames', DEFAULT_PREVIEW_FRAMES))
+    except (ValueError, TypeError) as e:
+        await discard_upload()
+        return error_response('INVALID_PARAMETER', f'Invalid parameter value: {str(e)}', 400)
+
+    mask_file = uploaded_file(form, 'roi_mask')
+    validation_errors = validate_parameters(params, mask_file)
+    if not (1 <= frame_count <= MAX_PREVIEW_FRAMES):
+        validation_errors.append(f'frames must be between 1 and {MAX_PREVIEW_FRAMES}')
+
+    if validation_errors:
+        await discard_upload()
+        return error_response('INVALID_PARAMETER', '; '.join(validation_errors), 400)
+
+    mask_path = Path(existing['mask_path']) if existing and existing.get('mask_path') else None
+    if mask_file and mask_file.filename:
+        # Queued and running jobs read the preview's mask, so it can't change under them
+        if existing and preview_in_use(preview_id):
+            return error_response(
+                'PREVIEW_IN_USE',
+                'A queued or running job is still reading this preview\'s ROI mask',
+                409
+            )
+        try:
+            mask_path = await save_roi_mask(mask_file, preview_id)
+        except Exception as e:
+            await discard_upload()
+            return error_response('FILE_SAVE_ERROR', f'Failed to save ROI mask: {str(e)}', 500)
+        params['roi_mask'] = secure_filename(mask_file.filename)
+        if existing and existing.get('mask_path') != str(mask_path):
+            await discard_files(existing.get('mask_path'))
+    elif existing and mask_path:
+        params['roi_mask'] = existing['parameters'].get('roi_mask')
+
+    # Only a handful of frames are OCR'd, so the request waits for them (in the preview pool)
+    storage.pin(input_path)
+    try:
+        result = await run_in_worker(
+            'preview', job_worker.preview_job,
+            str(input_path), frame_count, params, str(mask_path) if mask_path else None
+        )
+    except Exception as e:
+        await discard_upload()
+        if not existing:
+            await discard_files(mask_path)
+        return error_response('PREVIEW_FAILED', f'Failed to preview video: {str(e)}', 422)
+    finally:
+        storage.unpin(input_path)
+
+    created_at = existing['created_at'] if existing else datetime.utcnow().isoformat() + 'Z'
+    previews[preview_id] = {
+        'preview_id': preview_id,
+        'created_at': created_at,
+        'input_file': filename,
+        'input_path': str(input_path),
+        'mask_path': str(mask_path) if mask_path else None,
+        'parameters': params
+    }
+
+    frames = []
+    for entry in result['frames']:
+        entry = dict(entry)
+        thumbnail = entry.pop('thumbnail')
+        entry['thumbnail'] = base64.b64encode(thumbnail).decode('ascii') if thumbnail else None
+        frames.append(entry)
+
+    return JSONResponse({
+        'preview_id': preview_id,
+        'created_at': created_at,
+        'input_file': filename,
+        'parameters': params,
+        'duration': result['duration'],
+        'total_frames': result['total_frames'],
+        'matched_frames': result['matched_frames'],
+        'frames': frames,
+        'estimated_duration': await run_in_threadpool(
+            estimate_duration, input_path, params['target_speed']
+        )
+    })
+
+
+async def delete_preview(request: Request):
+    """Delete a preview and its uploaded video."""
+    # Check API key if configured
+    auth_error = check_api_key(request)
+    if auth_error:
+        return auth_error
+
+    preview_id = request.path_params['preview_id']
+    if preview_id not in previews:
+        return error_response('PREVIEW_NOT_FOUND', f'Preview {preview_id} not found', 404)
+    if preview_in_use(preview_id):
+        return error_response(
+            'PREVIEW_IN_USE', 'A queued or running job is still reading this preview\'s upload', 409
+        )
+
+    preview = previews.pop(preview_id)
+    try:
+        await discard_files(preview['input_path'], preview.get('mask_path'))
+    except Exception as e:
+        print(f"Error cleaning up files for preview {preview_id}: {e}")
+
+    return Response(status_code=204)
+
+
+async def get_job_status(request: Request):
+    """Get job status."""
+    # Check API key if configured
+    auth_error = check_api_key(request)
+    if auth_error:
+        return auth_error
+
+    job_id = request.path_params['job_id']
+    if job_id not in jobs:
+        return error_response('JOB_NOT_FOUND', f'Job {job_id} not found', 404)
+    job = jobs[job_id]
+
+    # Build response
     response = {
         'job_id': job['job_id'],
         'status': job['status'],
@@ -363,7 +884,7 @@ def get_job_status(job_id: str):
         'parameters': job['parameters'],
         'progress': job.get('progress', 0)
     }
-    
+
     # Add optional fields
     if 'started_at' in job:
         response['started_at'] = job['started_at']
@@ -373,121 +894,138 @@ def get_job_status(job_id: str):
         response['error'] = job['error']
     if 'result_url' in job:
         response['result_url'] = job['result_url']
-    
-    return jsonify(response)
+    if job.get('preview_id'):
+        response['preview_id'] = job['preview_id']
+    if job.get('result_evicted'):
+        response['result_evicted'] = True
 
+    return JSONResponse(response)
 
-@app.route('/api/v1/jobs/<job_id>/result', methods=['GET'])
-def download_result(job_id: str):
-    """Download processed video. FIX 3 & 6: Fixed deprecated parameter and thread safety."""
+
+async def download_result(request: Request):
+    """Download processed video, streamed from disk without blocking the event loop."""
     # Check API key if configured
-    auth_error = check_api_key()
+    auth_error = check_api_key(request)
     if auth_error:
         return auth_error
-    
-    # FIX 6: Thread-safe job access
-    with jobs_lock:
-        if job_id not in jobs:
-            return jsonify({
-                'error': 'JOB_NOT_FOUND',
-                'message': f'Job {job_id} not found'
-            }), 404
-        
-        job = jobs[job_id].copy()
-    
+
+    job_id = request.path_params['job_id']
+    if job_id not in jobs:
+        return error_response('JOB_NOT_FOUND', f'Job {job_id} not found', 404)
+    job = jobs[job_id]
+
     if job['status'] != 'completed':
-        return jsonify({
-            'error': 'RESULT_NOT_READY',
-            'message': f'Job is {job["status"]}, result not available'
-        }), 425
-    
+        return error_response(
+            'RESULT_NOT_READY', f'Job is {job["status"]}, result not available', 425
+        )
+
+    # An eviction still running in the threadpool has untracked the result before
+    # reserve_space() gets to mark the job
     output_path = Path(job['output_path'])
+    if job.get('result_evicted') or not (output_path.exists() or storage.tracks(output_path)):
+        return error_response(
+            'RESULT_EVICTED', 'Result was removed to free storage; submit the job again', 410
+        )
+
     if not output_path.exists():
-        return jsonify({
-            'error': 'RESULT_NOT_FOUND',
-            'message': 'Result file not found'
-        }), 404
-    
+        return error_response('RESULT_NOT_FOUND', 'Result file not found', 404)
+
     # Detect MIME type from file extension
     mimetype, _ = mimetypes.guess_type(str(output_path))
     if not mimetype:
         mimetype = 'video/mp4'  # Default fallback
-    
-    # FIX 3: Use download_name instead of deprecated attachment_filename
-    return send_file(
-        str(output_path),
-        as_attachment=True,
-        download_name=job['output_file'],
-        mimetype=mimetype
+
+    # Downloads decide which results are evicted last
+    storage.touch(output_path)
+
+    return FileResponse(
+        output_path,
+        filename=job['output_file'],
+        media_type=mimetype
     )
 
 
-@app.route('/api/v1/jobs/<job_id>', methods=['DELETE'])
-def delete_job(job_id: str):
-    """Cancel or delete job. FIX 6: Thread-safe job deletion."""
+async def delete_job(request: Request):
+    """Cancel or delete job."""
     # Check API key if configured
-    auth_error = check_api_key()
+    auth_error = check_api_key(request)
     if auth_error:
         return auth_error
-    
-    # FIX 6: Thread-safe job access and deletion
-    with jobs_lock:
-        if job_id not in jobs:
-            return jsonify({
-                'error': 'JOB_NOT_FOUND',
-                'message': f'Job {job_id} not found'
-            }), 404
-        
-        job = jobs[job_id].copy()
-        del jobs[job_id]
-    
-    # Clean up files (outside lock to avoid blocking)
+
+    job_id = request.path_params['job_id']
+    if job_id not in jobs:
+        return error_response('JOB_NOT_FOUND', f'Job {job_id} not found', 404)
+    job = jobs.pop(job_id)
+
+    # Clean up files on a worker thread
     try:
-        input_path = Path(job['input_path'])
-        if input_path.exists():
-            input_path.unlink()
-        
-        output_path = Path(job['output_path'])
-        if output_path.exists():
-            output_path.unlink()
+        await run_in_threadpool(remove_job_files, job)
     except Exception as e:
         print(f"Error cleaning up files for job {job_id}: {e}")
-    
-    return '', 204
-
 
-@app.errorhandler(413)
-def too_large(e):
-    """Handle file too large error."""
-    return jsonify({
-        'error': 'FILE_TOO_LARGE',
-        'message': f'File size exceeds maximum limit of {MAX_FILE_SIZE // (1024*1024)}MB'
-    }), 413
+    return Response(status_code=204)
 
 
-@app.errorhandler(500)
-def internal_error(e):
+async def internal_error(request: Request, exc: Exception):
     """Handle internal server errors."""
-    return jsonify({
-        'error': 'INTERNAL_ERROR',
-        'message': 'An internal server error occurred'
-    }), 500
+    return error_response('INTERNAL_ERROR', 'An internal server error occurred', 500)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Start worker pools and the cleanup task with the server, and stop them with it."""
+    storage.scan()
+    for name in POOL_SIZES:
+        start_worker_pool(name)
+
+    # FIX 5: Start cleanup task to prevent memory/disk leaks
+    cleanup_task = asyncio.create_task(cleanup_old_jobs())
+    try:
+        yield
+    finally:
+        cleanup_task.cancel()
+        for pool in worker_pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+routes = [
+    Route('/', index),
+    Mount('/static', StaticFiles(directory=BASE_DIR / 'static'), name='static'),
+    Route('/swagger', swagger_ui),
+    Route('/api/v1/openapi.yaml', openapi_spec),
+    Route('/api/v1/health', health_check, methods=['GET']),
+    Route('/api/v1/videos/blur', blur_video, methods=['POST']),
+    Route('/api/v1/videos/preview', preview_video, methods=['POST']),
+    Route('/api/v1/previews/{preview_id}', delete_preview, methods=['DELETE']),
+    Route('/api/v1/jobs/{job_id}', get_job_status, methods=['GET']),
+    Route('/api/v1/jobs/{job_id}', delete_job, methods=['DELETE']),
+    Route('/api/v1/jobs/{job_id}/result', download_result, methods=['GET']),
+]
+
+# Use debug mode only in development (check environment variable)
+debug_mode = os.environ.get('API_DEBUG', 'False').lower() == 'true'
+
+app = Starlette(
+    debug=debug_mode,
+    routes=routes,
+    # Enable CORS for all routes
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])
+    ],
+    exception_handlers={500: internal_error},
+    lifespan=lifespan
+)
 
 
 if __name__ == '__main__':
-    # Set max file size
-    app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
-    
-    # FIX 5: Start cleanup thread to prevent memory/disk leaks
-    cleanup_thread = threading.Thread(target=cleanup_old_jobs, daemon=True)
-    cleanup_thread.start()
-    
+    import uvicorn
+
     print("Starting Video Text Blur API Server...")
     print("API Documentation: http://localhost:8000/swagger")
     print("Health Check: http://localhost:8000/api/v1/health")
-    
-    # Use debug mode only in development (check environment variable)
-    debug_mode = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
-    app.run(host='0.0.0.0', port=8000, debug=debug_mode)
+
+    # Job state lives in this process, so run a single server process;
+    # processing scales with PROCESSING_WORKERS instead
+    uvicorn.run(app, host='0.0.0.0', port=8000, log_level='debug' if debug_mode else 'info')
 
 # Made with Bob
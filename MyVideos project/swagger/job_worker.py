@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Processing Worker for the Video Text Blur API
+
+Runs OCR and encoding in worker processes so the API's event loop only
+handles I/O. Each worker keeps the OCR engines it has loaded and reuses
+them for later jobs and previews with the same backend and languages.
+"""
+
+import os
+import sys
+from typing import Dict, Optional
+
+# Add parent directory to path to import blur_text_video
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from blur_text_video import VideoTextBlur
+from ocr_backends import create_backend
+from text_prefilter import TextPresenceFilter
+from scan_regions import ScanRegions
+
+# OCR backend models are configured server-side, never supplied by clients
+OCR_BACKEND_OPTIONS = {
+    'detector_model': os.environ.get('OCR_DETECTOR_MODEL'),
+    'detector_type': os.environ.get('OCR_DETECTOR_TYPE', 'east'),
+    'recognizer_model': os.environ.get('OCR_RECOGNIZER_MODEL'),
+    'vocabulary': os.environ.get('OCR_VOCABULARY')
+}
+
+# Scheduling priority of worker processes; positive values leave the CPU to the API's event loop
+WORKER_NICENESS = int(os.environ.get('WORKER_NICENESS', 10))
+
+# OCR engines loaded by this worker process, keyed by (backend, languages)
+_backends = {}
+
+
+def init_worker():
+    """Lower the worker process's priority so requests are served first when CPUs are busy."""
+    if WORKER_NICENESS and hasattr(os, 'nice'):
+        os.nice(WORKER_NICENESS)
+
+
+def get_backend(name: str, languages):
+    """Load an OCR backend once per worker process and reuse it."""
+    key = (name, tuple(languages))
+    if key not in _backends:
+        _backends[key] = create_backend(name, list(languages), **OCR_BACKEND_OPTIONS)
+    return _backends[key]
+
+
+def create_blur_processor(params: Dict, mask_path: Optional[str]) -> VideoTextBlur:
+    """Create a VideoTextBlur for a job's or preview's parameters."""
+    # Restrict OCR to the requested zones, if any
+    scan_regions = None
+    if params.get('roi') or params.get('exclude') or mask_path:
+        scan_regions = ScanRegions(
+            include=params.get('roi'),
+            exclude=params.get('exclude'),
+            mask_path=mask_path
+        )
+
+    languages = params.get('languages', ['en'])
+    return VideoTextBlur(
+        languages=languages,
+        blur_strength=params.get('blur_strength', 51),
+        confidence_threshold=params.get('confidence', 0.5),
+        target_words=params.get('words', None),
+        ocr_backend=get_backend(params.get('ocr_backend', 'easyocr'), languages),
+        prefilter=TextPresenceFilter(
+            min_candidates=params.get('prefilter_candidates', 3),
+            min_contrast=params.get('prefilter_contrast', 32)
+        ) if params.get('prefilter') else None,
+        scan_regions=scan_regions
+    )
+
+
+def process_job(input_path: str, output_path: str, params: Dict, mask_path: Optional[str]) -> Dict:
+    """Blur a video (runs in a worker process). Returns process_video() statistics."""
+    blur = create_blur_processor(params, mask_path)
+    return blur.process_video(
+        input_path,
+        output_path,
+        sample_rate=params.get('sample_rate', 1),
+        padding=params.get('padding', 10),
+        partial_reencode=params.get('partial_reencode', False),
+        target_speed=params.get('target_speed'),
+        max_sample_gap=params.get('max_sample_gap')
+    )
+
+
+def preview_job(input_path: str, frame_count: int, params: Dict, mask_path: Optional[str]) -> Dict:
+    """OCR a few frames of a video (runs in a worker process). Returns preview_video() results."""
+    blur = create_blur_processor(params, mask_path)
+    return blur.preview_video(input_path, frame_count, padding=params.get('padding', 10))
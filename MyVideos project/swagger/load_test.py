@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Load Test for the Video Text Blur API
+
+Checks that job status requests stay fast while many uploads stream in.
+Status latency is measured with the server idle, then again while N clients
+upload a video concurrently (optionally throttled, to simulate slow
+clients). Fails if the p95 latency during uploads exceeds --max-ratio
+times the idle p95 (plus --slack-ms, so sub-millisecond baselines don't
+make the check flaky).
+
+Usage:
+    python api_server.py &
+    python load_test.py sample.mp4 --uploads 100 --rate 2MB
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+
+def parse_rate(value):
+    """Parse a per-upload bandwidth such as '512KB', '2MB' or '0' (unthrottled) into bytes/second"""
+    value = value.strip().upper()
+    for suffix, factor in (('KB', 1024), ('MB', 1024**2), ('B', 1)):
+        if value.endswith(suffix):
+            return int(float(value[:-len(suffix)]) * factor)
+    return int(float(value))
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(samples):
+    """p50/p95/max latency in milliseconds"""
+    return {
+        'count': len(samples),
+        'p50': percentile(samples, 0.50) * 1000,
+        'p95': percentile(samples, 0.95) * 1000,
+        'max': max(samples) * 1000
+    }
+
+
+class MultipartUpload:
+    """Streamed multipart/form-data body with a known Content-Length, sent at a limited rate"""
+
+    def __init__(self, video_path: Path, fields, rate=0, chunk_size=64 * 1024):
+        self.video_path = video_path
+        self.rate = rate
+        self.chunk_size = chunk_size
+        self.boundary = uuid.uuid4().hex
+        self.head = b''.join(
+            (f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+             f'{value}\r\n').encode()
+            for name, value in fields
+        ) + (
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="video"; '
+            f'filename="{video_path.name}"\r\nContent-Type: video/mp4\r\n\r\n'
+        ).encode()
+        self.tail = f'\r\n--{self.boundary}--\r\n'.encode()
+        self.length = len(self.head) + video_path.stat().st_size + len(self.tail)
+
+    @property
+    def headers(self):
+        return {
+            'Content-Type': f'multipart/form-data; boundary={self.boundary}',
+            'Content-Length': str(self.length)
+        }
+
+    async def __aiter__(self):
+        yield self.head
+        with open(self.video_path, 'rb') as video:
+            while True:
+                chunk = video.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+                if self.rate:
+                    await asyncio.sleep(len(chunk) / self.rate)
+        yield self.tail
+
+
+def poll_status(url, headers, job_id, stop, interval):
+    """
+    Time status requests for one job until stop is set
+
+    Runs on its own thread and connection, so time the upload clients spend
+    on this machine's event loop isn't counted as server latency.
+    """
+    samples = []
+    with httpx.Client(base_url=url, headers=headers) as client:
+        while not stop.is_set():
+            started = time.perf_counter()
+            response = client.get(f'/api/v1/jobs/{job_id}')
+            samples.append(time.perf_counter() - started)
+            response.raise_for_status()
+            stop.wait(interval)
+    return samples
+
+
+async def upload(client, video_path, fields, rate):
+    """Submit one blur job as a streamed upload. Returns (job ID or None, status code)"""
+    body = MultipartUpload(video_path, fields, rate)
+    response = await client.post('/api/v1/videos/blur', content=body, headers=body.headers)
+    job_id = response.json().get('job_id') if response.status_code == 202 else None
+    return job_id, response.status_code
+
+
+async def run(args):
+    headers = {'X-API-Key': args.api_key} if args.api_key else {}
+    fields = [('words', word) for word in args.words] + [('sample_rate', str(args.sample_rate))]
+    connections = args.uploads + 8
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    timeout = httpx.Timeout(args.timeout)
+
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits,
+                                 timeout=timeout) as client:
+        # One job to poll; it keeps a processing worker busy for the whole test
+        job_id, status = await upload(client, args.video, fields, 0)
+        if not job_id:
+            print(f"❌ Could not submit the polled job (HTTP {status})")
+            return 1
+        created = [job_id]
+        results = []
+
+        try:
+            print(f"Measuring idle status latency for {args.baseline:.0f}s...")
+            stop = threading.Event()
+            poller = asyncio.create_task(asyncio.to_thread(
+                poll_status, args.url, headers, job_id, stop, args.poll_interval))
+            await asyncio.sleep(args.baseline)
+            stop.set()
+            baseline = summarize(await poller)
+
+            print(f"Streaming {args.uploads} uploads of {args.video.name} "
+                  f"({args.video.stat().st_size // 1024}KB each"
+                  + (f", {args.rate // 1024}KB/s per client" if args.rate else "") + ")...")
+            stop = threading.Event()
+            poller = asyncio.create_task(asyncio.to_thread(
+                poll_status, args.url, headers, job_id, stop, args.poll_interval))
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *(upload(client, args.video, fields, args.rate) for _ in range(args.uploads)),
+                return_exceptions=True
+            )
+            upload_time = time.perf_counter() - started
+            stop.set()
+            loaded = summarize(await poller)
+        finally:
+            if not args.keep_jobs:
+                created += [r[0] for r in results if isinstance(r, tuple) and r[0]]
+                for created_id in created:
+                    await client.delete(f'/api/v1/jobs/{created_id}')
+
+    accepted = sum(1 for r in results if isinstance(r, tuple) and r[0])
+    failures = [r if isinstance(r, Exception) else f'HTTP {r[1]}' for r in results
+                if not (isinstance(r, tuple) and r[0])]
+
+    print(f"\nUploads: {accepted}/{args.uploads} accepted in {upload_time:.1f}s")
+    for failure in failures[:5]:
+        print(f"  failed: {failure}")
+    print(f"\n{'Status latency':<18}{'requests':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for label, stats in (('idle', baseline), ('during uploads', loaded)):
+        print(f"{label:<18}{stats['count']:>10}"
+              f"{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['max']:>10.1f}")
+
+    limit = baseline['p95'] * args.max_ratio + args.slack_ms
+    if loaded['p95'] > limit:
+        print(f"\n❌ p95 during uploads {loaded['p95']:.1f} ms exceeds {limit:.1f} ms")
+        return 1
+    print(f"\n✓ Status latency stayed flat (p95 {loaded['p95']:.1f} ms, limit {limit:.1f} ms)")
+    return 1 if failures and not args.allow_failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure status latency while uploads stream into the API'
+    )
+    parser.add_argument('video', type=Path, help='Video file to upload')
+    parser.add_argument('--url', default='http://localhost:8000',
+                        help='API base URL (default: http://localhost:8000)')
+    parser.add_argument('--uploads', type=int, default=100,
+                        help='Concurrent uploads (default: 100)')
+    parser.add_argument('--rate', type=parse_rate, default=0,
+                        help="Bandwidth per upload, e.g. '512KB' (default: unthrottled)")
+    parser.add_argument('--words', nargs='*', default=['secret'],
+                        help='Words for the submitted jobs')
+    parser.add_argument('--sample-rate', type=int, default=1,
+                        help='sample_rate for the submitted jobs')
+    parser.add_argument('--baseline', type=float, default=5.0,
+                        help='Seconds of idle measurement (default: 5)')
+    parser.add_argument('--poll-interval', type=float, default=0.05,
+                        help='Seconds between status requests (default: 0.05)')
+    parser.add_argument('--max-ratio', type=float, default=3.0,
+                        help='Allowed p95 growth over idle (default: 3.0)')
+    parser.add_argument('--slack-ms', type=float, default=10.0,
+                        help='Latency added to the limit, in ms (default: 10)')
+    parser.add_argument('--timeout', type=float, default=600.0, help='Request timeout in seconds')
+    parser.add_argument('--api-key', default=os.environ.get('API_KEY'),
+                        help='API key (default: $API_KEY)')
+    parser.add_argument('--keep-jobs', action='store_true',
+                        help="Don't delete the jobs created by the test")
+    parser.add_argument('--allow-failures', action='store_true',
+                        help='Pass even if some uploads are rejected '
+                             '(e.g. 507 when storage is full)')
+    args = parser.parse_args()
+
+    if not args.video.exists():
+        parser.error(f'video not found: {args.video}')
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Storage Manager for the Video Text Blur API
+
+Keeps uploads/ and outputs/ within a byte budget. File sizes are tracked
+incrementally as files are added and removed, so checking the budget never
+walks the directories. When space is needed, files are evicted in order:
+leftovers from earlier server runs, then results by least recent download,
+then idle preview uploads by least recent use. Files in use are pinned and
+never evicted.
+"""
+
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# Eviction order: lower ranks go first
+EVICTION_RANK = {'orphan': 0, 'output': 1, 'preview': 2}
+
+
+class InsufficientStorage(Exception):
+    """Raised when space for a reservation can't be found even after evicting."""
+
+    def __init__(self, needed: int, available: int, evicted: Optional[List[Dict]] = None):
+        super().__init__(f'Not enough storage: {needed // (1024*1024)}MB needed, '
+                         f'{max(0, available) // (1024*1024)}MB available')
+        self.needed = needed
+        self.available = available
+        self.evicted = evicted or []  # Files evicted before running out of candidates
+
+
+class StorageManager:
+    def __init__(self, folders, budget_bytes: int, min_free_bytes: int = 0):
+        """
+        Initialize the storage manager
+
+        Args:
+            folders: Directories whose files count against the budget
+            budget_bytes: Maximum bytes stored across all folders
+            min_free_bytes: Free disk space to always leave on the volume
+        """
+        self.folders = [Path(folder) for folder in folders]
+        self.budget_bytes = budget_bytes
+        self.min_free_bytes = min_free_bytes
+        self.used = 0
+        self._files: Dict[str, Dict] = {}
+        self._reservations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def reserved(self) -> int:
+        """Bytes promised to uploads and jobs that haven't been written yet"""
+        return sum(self._reservations.values())
+
+    def scan(self):
+        """Track files already on disk (e.g. from a previous run) as evictable leftovers"""
+        for folder in self.folders:
+            for path in folder.iterdir():
+                if path.is_file():
+                    self.add(path, 'orphan', last_access=path.stat().st_mtime)
+
+    def add(self, path, kind: str, owner: Optional[str] = None, pinned: bool = False,
+            last_access: Optional[float] = None):
+        """
+        Start tracking a file
+
+        The file's size is taken out of its owner's reservation, if any.
+
+        Args:
+            path: File path
+            kind: 'input', 'mask', 'output', 'preview' or 'orphan'
+                (inputs and masks are never evicted)
+            owner: Job or preview ID the file belongs to
+            pinned: Protect the file from eviction until unpin()
+            last_access: Access time for LRU ordering (default: now)
+        """
+        path = Path(path)
+        size = path.stat().st_size
+        with self._lock:
+            previous = self._files.pop(str(path), None)
+            if previous:
+                self.used -= previous['size']
+            self._files[str(path)] = {
+                'path': str(path),
+                'size': size,
+                'kind': kind,
+                'owner': owner,
+                'pins': 1 if pinned else 0,
+                'last_access': time.time() if last_access is None else last_access
+            }
+            self.used += size
+            if owner in self._reservations:
+                self._reservations[owner] = max(0, self._reservations[owner] - size)
+
+    def tracks(self, path) -> bool:
+        """
+        Check whether a file is tracked (evicted and discarded files aren't)
+
+        Doesn't wait for the lock, so it answers during an eviction; entries
+        are dropped before their files are deleted.
+        """
+        return str(path) in self._files
+
+    def discard(self, path):
+        """Stop tracking a file (call after deleting it)"""
+        with self._lock:
+            entry = self._files.pop(str(path), None)
+            if entry:
+                self.used -= entry['size']
+
+    def touch(self, path):
+        """Record an access (e.g. a download) for LRU ordering"""
+        with self._lock:
+            entry = self._files.get(str(path))
+            if entry:
+                entry['last_access'] = time.time()
+
+    def pin(self, path):
+        """Protect a file from eviction while it is being read"""
+        with self._lock:
+            entry = self._files.get(str(path))
+            if entry:
+                entry['pins'] += 1
+                entry['last_access'] = time.time()
+
+    def unpin(self, path):
+        """Release a pin() once the file is no longer being read"""
+        with self._lock:
+            entry = self._files.get(str(path))
+            if entry and entry['pins']:
+                entry['pins'] -= 1
+
+    def reserve(self, owner: str, nbytes: int) -> List[Dict]:
+        """
+        Set aside space for files an upload or job is about to write
+
+        Evicts files if needed to stay within the budget and keep
+        min_free_bytes free on disk. The reservation shrinks as the owner's
+        files are add()ed; release() drops what is left.
+
+        Returns:
+            Entries of evicted files ({'path', 'size', 'kind', 'owner', ...}),
+            so the caller can update the records that referenced them
+
+        Raises:
+            InsufficientStorage: If there isn't enough space even after evicting
+                (its evicted attribute lists the files evicted anyway)
+        """
+        free = shutil.disk_usage(self.folders[0]).free
+        evicted = []
+        with self._lock:
+            def shortfall():
+                over_budget = self.used + self.reserved + nbytes - self.budget_bytes
+                under_free = nbytes + self.reserved + self.min_free_bytes - free
+                return max(over_budget, under_free)
+
+            if shortfall() > 0:
+                candidates = sorted(
+                    (entry for entry in self._files.values()
+                     if entry['kind'] in EVICTION_RANK and not entry['pins']),
+                    key=lambda entry: (EVICTION_RANK[entry['kind']], entry['last_access'])
+                )
+                for entry in candidates:
+                    if shortfall() <= 0:
+                        break
+                    # Untrack first, so a missing file is never mistaken for a lost tracked one
+                    del self._files[entry['path']]
+                    try:
+                        Path(entry['path']).unlink()
+                    except FileNotFoundError:
+                        pass
+                    self.used -= entry['size']
+                    free += entry['size']
+                    evicted.append(entry)
+
+            needed = shortfall()
+            if needed <= 0:
+                self._reservations[owner] = self._reservations.get(owner, 0) + nbytes
+
+        for entry in evicted:
+            print(f"Evicted {entry['kind']} {entry['path']} ({entry['size'] // (1024*1024)}MB)")
+        if needed > 0:
+            raise InsufficientStorage(nbytes, nbytes - needed, evicted)
+        return evicted
+
+    def release(self, owner: str):
+        """Drop whatever is left of an owner's reservation"""
+        with self._lock:
+            self._reservations.pop(owner, None)
+
+    def stats(self) -> Dict:
+        """Current usage for monitoring"""
+        with self._lock:
+            by_kind: Dict[str, int] = {}
+            for entry in self._files.values():
+                by_kind[entry['kind']] = by_kind.get(entry['kind'], 0) + entry['size']
+            return {
+                'budget_bytes': self.budget_bytes,
+                'used_bytes': self.used,
+                'reserved_bytes': self.reserved,
+                'files': len(self._files),
+                'bytes_by_kind': by_kind
+            }
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for batch input collection
+"""
+
+import os
+import sys
+
+# Add parent directory to path to import the tool's modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from batch_blur import collect_inputs
+
+
+def test_missing_explicit_and_manifest_entries_are_reported(tmp_path, capsys):
+    (tmp_path / 'a.mp4').touch()
+    (tmp_path / 'notes.txt').touch()
+    manifest = tmp_path / 'todo.txt'
+    manifest.write_text('a.mp4\ntypo.mov\nnotes.txt\n')
+
+    inputs = collect_inputs([str(tmp_path / 'missing.mp4')], str(manifest))
+
+    assert inputs == [tmp_path / 'a.mp4']
+    errors = capsys.readouterr().err
+    assert 'missing.mp4: file not found' in errors
+    assert 'typo.mov: file not found' in errors
+    assert 'notes.txt: not an MP4/MOV video' in errors
+
+
+def test_directory_and_glob_expansion_skip_other_files_silently(tmp_path, capsys):
+    (tmp_path / 'a.mp4').touch()
+    (tmp_path / 'b.MOV').touch()
+    (tmp_path / 'notes.txt').touch()
+
+    inputs = collect_inputs([str(tmp_path), str(tmp_path / '*')])
+
+    assert inputs == [tmp_path / 'a.mp4', tmp_path / 'b.MOV']
+    assert capsys.readouterr().err == ''
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tests for the OCR backends: the OpenCV DNN backend's recognition reuse
+(with ROI zones and text that changes in place) and EasyOCR detection
+
+The detectors and recognizers are stubbed, so no models are needed.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add parent directory to path to import the tool's modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ocr_backends import EasyOCRBackend, OpenCVDNNBackend
+from scan_regions import ScanRegions
+from blur_text_video import VideoTextBlur
+
+
+# Two zones of a 200x100 frame, far enough apart to be OCR'd as separate crops
+LEFT_ZONE = '0,0,80,100'
+RIGHT_ZONE = '120,0,80,100'
+TEXT_BOX = (10, 10, 60, 40)  # Where the stub detector finds text inside any crop
+
+
+class StubDetector:
+    """Finds one text box at the same position in every image"""
+
+    def detect(self, image):
+        x1, y1, x2, y2 = TEXT_BOX
+        return [np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]])], [0.9]
+
+
+class StubRecognizer:
+    """Reads bright regions as 'password' and dark ones as 'hello'"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def recognize(self, crop):
+        self.calls += 1
+        return 'password' if crop.mean() > 128 else 'hello'
+
+
+def make_backend():
+    backend = OpenCVDNNBackend.__new__(OpenCVDNNBackend)
+    backend.detector = StubDetector()
+    backend.recognizer = StubRecognizer()
+    backend.fallback = None
+    backend.reuse_iou = 0.7
+    backend.reuse_max_diff = 8.0
+    backend.reuse_refresh = 30
+    backend.previous = {}
+    return backend
+
+
+def make_frame(left_bright, right_bright):
+    """Frame with text (bright or dark) at TEXT_BOX inside each zone"""
+    frame = np.full((100, 200, 3), 60, dtype=np.uint8)
+    x1, y1, x2, y2 = TEXT_BOX
+    frame[y1:y2, x1:x2] = 220 if left_bright else 20
+    frame[y1:y2, 120 + x1:120 + x2] = 220 if right_bright else 20
+    return frame
+
+
+def make_processor(backend):
+    return VideoTextBlur(
+        target_words=['password'],
+        ocr_backend=backend,
+        scan_regions=ScanRegions(include=[LEFT_ZONE, RIGHT_ZONE])
+    )
+
+
+def test_zones_do_not_reuse_each_others_text():
+    processor = make_processor(make_backend())
+
+    boxes = processor.detect_text_regions(make_frame(left_bright=False, right_bright=True))
+
+    assert [box[4] for box in boxes] == ['password']
+    assert boxes[0][:4] == (130, 10, 180, 40)
+
+
+def test_text_in_first_zone_does_not_blur_second_zone():
+    processor = make_processor(make_backend())
+
+    boxes = processor.detect_text_regions(make_frame(left_bright=True, right_bright=False))
+
+    assert [box[:4] for box in boxes] == [(10, 10, 60, 40)]
+
+
+def test_each_zone_reuses_its_own_text_on_later_frames():
+    backend = make_backend()
+    processor = make_processor(backend)
+    frame = make_frame(left_bright=False, right_bright=True)
+
+    processor.detect_text_regions(frame)
+    boxes = processor.detect_text_regions(frame)
+
+    assert [box[4] for box in boxes] == ['password']
+    assert backend.recognizer.calls == 2  # Once per zone, on the first frame only
+
+
+def test_reset_clears_reused_text():
+    backend = make_backend()
+    processor = make_processor(backend)
+    frame = make_frame(left_bright=False, right_bright=True)
+
+    processor.detect_text_regions(frame)
+    backend.reset()
+    processor.detect_text_regions(frame)
+
+    assert backend.recognizer.calls == 4
+
+
+def test_text_changed_in_place_is_read_again():
+    backend = make_backend()
+    processor = make_processor(backend)
+
+    first = processor.detect_text_regions(make_frame(left_bright=False, right_bright=False))
+    second = processor.detect_text_regions(make_frame(left_bright=True, right_bright=False))
+
+    assert first == []
+    assert [box[:4] for box in second] == [(10, 10, 60, 40)]
+
+
+def test_unchanged_text_is_read_again_after_reuse_refresh_calls():
+    backend = make_backend()
+    backend.reuse_refresh = 3
+    frame = make_frame(left_bright=True, right_bright=True)
+
+    for _ in range(4):
+        backend.readtext(frame)
+
+    assert backend.recognizer.calls == 2  # Calls 1 and 4
+
+
+class StubEasyOCRReader:
+    """easyocr.Reader.detect output for one image: one horizontal box and one free-form quad"""
+
+    def detect(self, image):
+        return [[[10, 60, 5, 25]]], [[[[70, 30], [120, 35], [118, 50], [68, 45]]]]
+
+    def readtext(self, image, **options):
+        raise AssertionError('blur-all mode should not run recognition')
+
+
+def test_easyocr_blur_all_mode_only_detects():
+    backend = EasyOCRBackend.__new__(EasyOCRBackend)
+    backend.reader = StubEasyOCRReader()
+    backend.batch_size = 1
+    processor = VideoTextBlur(target_words=None, ocr_backend=backend)
+
+    boxes = processor.detect_text_regions(np.zeros((100, 200, 3), dtype=np.uint8))
+
+    assert [box[:4] for box in boxes] == [(10, 5, 60, 25), (68, 30, 120, 50)]
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the partial re-encode helpers
+
+ffprobe is stubbed with canned output, so no ffmpeg install is needed.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Add parent directory to path to import the tool's modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import partial_reencode
+from partial_reencode import encoder_settings, keyframe_index, plan_chunks
+
+
+def stub_ffprobe(monkeypatch, stdout):
+    """Make subprocess.run return stdout as ffprobe output"""
+    def run(command, **options):
+        return subprocess.CompletedProcess(command, 0, stdout=stdout, stderr='')
+    monkeypatch.setattr(partial_reencode.subprocess, 'run', run)
+
+
+def test_plan_chunks_merges_neighbouring_gops():
+    chunks = plan_chunks([0, 25, 50, 75, 100], 120, [30, 60, 110])
+
+    assert chunks == [(0, 25, False), (25, 75, True), (75, 100, False), (100, 120, True)]
+
+
+def test_plan_chunks_without_dirty_frames_copies_everything():
+    assert plan_chunks([0, 25, 50], 60, []) == [(0, 60, False)]
+
+
+def test_plan_chunks_dirty_first_and_last_frames():
+    assert plan_chunks([0, 10, 20], 30, [0, 29]) == [(0, 10, True), (10, 20, False), (20, 30, True)]
+
+
+def test_keyframe_index_with_b_frames_and_start_offset(monkeypatch):
+    # Decode order of two 4-frame GOPs (I P B B) at 25 fps, starting at 1.5s
+    stub_ffprobe(monkeypatch, '\n'.join([
+        '1.500000,K_', '1.620000,__', '1.540000,__', '1.580000,__',
+        '1.660000,K_', '1.780000,__', '1.700000,__', '1.740000,__',
+        'N/A,__'
+    ]))
+
+    keyframes, times, total_frames = keyframe_index('input.mp4')
+
+    assert keyframes == [0, 4]
+    assert times == pytest.approx([0.0, 0.16])
+    assert total_frames == 8
+
+
+def test_keyframe_index_leading_frames_join_the_first_chunk(monkeypatch):
+    # Open GOP: two B-frames are presented before the first keyframe
+    stub_ffprobe(monkeypatch, '\n'.join([
+        '10.080000,K_', '10.000000,__', '10.040000,__', '10.120000,__', '10.160000,K_'
+    ]))
+
+    keyframes, times, total_frames = keyframe_index('input.mp4')
+
+    assert keyframes == [0, 2, 4]
+    assert times == pytest.approx([0.0, 0.08, 0.16])
+    assert total_frames == 5
+
+
+def test_encoder_settings_match_the_source_stream():
+    info = {'profile': 'Main', 'level': 31, 'refs': 3, 'has_b_frames': 2, 'pix_fmt': 'yuvj420p'}
+
+    assert encoder_settings(info) == ['-profile:v', 'main', '-pix_fmt', 'yuvj420p',
+                                      '-level:v', '3.1', '-refs', '3']
+
+
+def test_encoder_settings_disable_b_frames_for_baseline_sources():
+    info = {'profile': 'Constrained Baseline', 'level': 9, 'refs': 1, 'has_b_frames': 0,
+            'pix_fmt': 'yuv420p'}
+
+    assert encoder_settings(info) == ['-profile:v', 'baseline', '-pix_fmt', 'yuv420p',
+                                      '-level:v', '1b', '-refs', '1', '-bf', '0']
+
+
+@pytest.mark.parametrize('profile', ['High 10', 'High 4:4:4 Predictive', None])
+def test_encoder_settings_reject_profiles_libx264_cannot_match(profile):
+    assert encoder_settings({'profile': profile, 'pix_fmt': 'yuv420p'}) is None
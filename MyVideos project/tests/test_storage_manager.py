@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the API's storage manager, with small byte budgets in a temp directory
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the swagger directory to path to import the API's modules
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_DIR, 'swagger'))
+from storage_manager import InsufficientStorage, StorageManager
+
+
+def write(folder, name, size):
+    path = folder / name
+    path.write_bytes(b'x' * size)
+    return path
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return StorageManager([tmp_path], budget_bytes=1000)
+
+
+def test_eviction_order_orphans_then_outputs_by_download_then_previews(tmp_path, storage):
+    preview = write(tmp_path, 'preview.mp4', 100)
+    recent = write(tmp_path, 'recent.mp4', 100)
+    stale = write(tmp_path, 'stale.mp4', 100)
+    orphan = write(tmp_path, 'orphan.mp4', 100)
+    storage.add(preview, 'preview', owner='p', last_access=1)
+    storage.add(recent, 'output', owner='a', last_access=20)
+    storage.add(stale, 'output', owner='b', last_access=10)
+    storage.add(orphan, 'orphan', last_access=30)
+    storage.add(write(tmp_path, 'input.mp4', 500), 'input', owner='c')
+
+    evicted = storage.reserve('new', 400)
+
+    assert [entry['path'] for entry in evicted] == [str(orphan), str(stale), str(recent)]
+    assert not orphan.exists() and not stale.exists() and not recent.exists()
+    assert preview.exists()
+    assert storage.used == 600
+    assert not storage.tracks(stale)
+
+
+def test_pinned_files_are_not_evicted(tmp_path, storage):
+    pinned = write(tmp_path, 'pinned.mp4', 300)
+    idle = write(tmp_path, 'idle.mp4', 300)
+    storage.add(pinned, 'output', owner='a', last_access=1)
+    storage.add(idle, 'output', owner='b', last_access=2)
+    storage.pin(pinned)
+
+    evicted = storage.reserve('new', 600)
+
+    assert [entry['path'] for entry in evicted] == [str(idle)]
+    assert pinned.exists()
+
+
+def test_unpinned_files_can_be_evicted_again(tmp_path, storage):
+    output = write(tmp_path, 'out.mp4', 600)
+    storage.add(output, 'output', owner='a', pinned=True)
+    storage.unpin(output)
+
+    assert [entry['path'] for entry in storage.reserve('new', 600)] == [str(output)]
+
+
+def test_reservation_shrinks_as_files_are_added(tmp_path, storage):
+    storage.reserve('job', 500)
+    storage.add(write(tmp_path, 'upload.mp4', 200), 'input', owner='job')
+
+    assert storage.reserved == 300
+    assert storage.used == 200
+
+    storage.release('job')
+    assert storage.reserved == 0
+
+
+def test_reservations_count_against_the_budget(storage):
+    storage.reserve('first', 700)
+
+    with pytest.raises(InsufficientStorage):
+        storage.reserve('second', 400)
+
+
+def test_insufficient_storage_after_partial_eviction_reports_evicted_files(tmp_path, storage):
+    output = write(tmp_path, 'out.mp4', 300)
+    storage.add(output, 'output', owner='a')
+    storage.add(write(tmp_path, 'input.mp4', 500), 'input', owner='b')
+
+    with pytest.raises(InsufficientStorage) as error:
+        storage.reserve('new', 800)
+
+    assert [entry['path'] for entry in error.value.evicted] == [str(output)]
+    assert not output.exists()
+    assert storage.used == 500
+    assert storage.reserved == 0
+
+
+def test_scan_tracks_leftover_files_as_orphans(tmp_path, storage):
+    write(tmp_path, 'leftover.mp4', 100)
+
+    storage.scan()
+
+    assert storage.stats()['bytes_by_kind'] == {'orphan': 100}
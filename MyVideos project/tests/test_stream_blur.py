@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming mode's latency tracking
+
+The ffmpeg decoder and encoder are replaced by an in-process paced source
+and a discarding sink, so the tests run without ffmpeg.
+"""
+
+import os
+import sys
+import time
+
+# Add parent directory to path to import the tool's modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import stream_blur
+
+
+WIDTH, HEIGHT, FPS = 16, 8, 100
+FRAMES = 60
+
+
+class PacedSource:
+    """Raw BGR frames delivered at FPS, pausing for stall seconds after frame stall_after"""
+
+    def __init__(self, stall_after=None, stall=0.0):
+        self.frame_size = WIDTH * HEIGHT * 3
+        self.stall_after = stall_after
+        self.stall = stall
+        self.start = None
+        self.index = 0
+        self.offset = 0
+
+    def readinto(self, view):
+        if self.index >= FRAMES:
+            return 0
+        if self.offset == 0:
+            if self.start is None:
+                self.start = time.monotonic()
+            due = self.start + self.index / FPS
+            if self.stall_after is not None and self.index > self.stall_after:
+                due += self.stall
+            time.sleep(max(0.0, due - time.monotonic()))
+        n = min(len(view), self.frame_size - self.offset)
+        view[:n] = bytes(n)
+        self.offset += n
+        if self.offset == self.frame_size:
+            self.index += 1
+            self.offset = 0
+        return n
+
+
+class FakeDecoder:
+    def __init__(self, source):
+        self.stdout = source
+
+    def terminate(self):
+        pass
+
+    def wait(self):
+        return 0
+
+
+class NullSink:
+    def write(self, data):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeEncoder:
+    stdin = NullSink()
+
+    def wait(self):
+        return 0
+
+
+class StubReader:
+    def reset(self):
+        pass
+
+
+class StubProcessor:
+    """Finds no text, taking ocr_seconds per OCR'd frame"""
+
+    def __init__(self, ocr_seconds=0.0):
+        self.reader = StubReader()
+        self.ocr_seconds = ocr_seconds
+
+    def scan_frame(self, frame):
+        time.sleep(self.ocr_seconds)
+        return []
+
+    def blur_regions(self, frame, boxes, padding, in_place=False):
+        pass
+
+
+def run_stream(monkeypatch, source, processor, **options):
+    monkeypatch.setattr(stream_blur, 'open_decoder', lambda *args, **kwargs: FakeDecoder(source))
+    monkeypatch.setattr(stream_blur, 'open_encoder', lambda *args, **kwargs: FakeEncoder())
+    return stream_blur.process_stream(processor, '-', '-', WIDTH, HEIGHT, FPS,
+                                      latency_budget=0.05, **options)
+
+
+def test_upstream_stall_is_not_counted_as_lag(monkeypatch):
+    source = PacedSource(stall_after=20, stall=0.5)
+    stats = run_stream(monkeypatch, source, StubProcessor(), drop_late=True)
+
+    assert stats['dropped'] == 0
+    assert stats['frames'] == FRAMES
+    assert stats['relaxed'] == 0
+    assert stats['max_latency'] < 0.05
+
+
+def test_processing_backlog_still_counts_as_lag(monkeypatch):
+    # OCR takes three frame intervals, so frames queue up in the reader
+    stats = run_stream(monkeypatch, PacedSource(), StubProcessor(ocr_seconds=3 / FPS))
+
+    assert stats['relaxed'] > 0
+    assert stats['max_latency'] > 0.05
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Tests for the text presence prefilter on synthetic frames
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+# Add parent directory to path to import the tool's modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from text_prefilter import TextPresenceFilter
+
+
+def flat_frame(value=0):
+    return np.full((1080, 1920, 3), value, dtype=np.uint8)
+
+
+@pytest.mark.parametrize('scale', [0.5, 0.7])
+def test_single_small_word_on_flat_frame_passes(scale):
+    frame = flat_frame()
+    cv2.putText(frame, 'secret', (900, 540), cv2.FONT_HERSHEY_SIMPLEX, scale, (255, 255, 255), 1)
+
+    assert TextPresenceFilter().might_contain_text(frame)
+
+
+def test_blank_frames_are_skipped():
+    prefilter = TextPresenceFilter()
+
+    assert not prefilter.might_contain_text(flat_frame(0))
+    assert not prefilter.might_contain_text(flat_frame(90))
+    assert prefilter.stats()['frames_skipped'] == 2
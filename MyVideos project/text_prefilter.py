@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Text Presence Prefilter
+Cheap heuristics that decide whether a frame could contain text before running OCR
+"""
+
+import cv2
+import numpy as np
+
+
+class TextPresenceFilter:
+    def __init__(self, min_candidates=3, min_edge_density=0.0002, min_contrast=32, max_width=960):
+        """
+        Initialize the text presence prefilter
+
+        The filter is deliberately false-negative-averse: a frame is only
+        rejected when neither character-like regions (MSER blobs with text
+        geometry and a consistent stroke width) nor text-line shaped gradient
+        blobs are found. The edge density only decides whether the MSER search
+        is worth running; a flat frame still gets the text-line check. Lower
+        thresholds skip fewer frames but never miss more text.
+
+        Args:
+            min_candidates: Minimum number of character-like regions for a frame to pass
+            min_edge_density: Fraction of edge pixels (0-1) below which the MSER search is skipped
+            min_contrast: Minimum gradient magnitude (0-255) for text-line detection
+            max_width: Frames are downscaled to this width before analysis
+        """
+        self.min_candidates = min_candidates
+        self.min_edge_density = min_edge_density
+        self.min_contrast = min_contrast
+        self.max_width = max_width
+        self.mser = cv2.MSER_create(5, 10, 4000)
+        self.frames_checked = 0
+        self.frames_skipped = 0
+
+    def might_contain_text(self, frame):
+        """
+        Check whether a frame could contain text
+
+        Args:
+            frame: BGR input frame
+
+        Returns:
+            True if the frame should go to OCR, False if it can be skipped
+        """
+        self.frames_checked += 1
+
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if gray.shape[1] > self.max_width:
+            scale = self.max_width / gray.shape[1]
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        # Flat frames (fades, blank screens, soft camera shots) aren't worth the MSER search
+        edges = cv2.Canny(gray, 100, 200)
+        if np.count_nonzero(edges) / edges.size >= self.min_edge_density:
+            # Check dark-on-light and light-on-dark text
+            candidates = 0
+            for image in (gray, 255 - gray):
+                regions, _ = self.mser.detectRegions(image)
+                for points in regions:
+                    if self._is_character_like(points):
+                        candidates += 1
+                        if candidates >= self.min_candidates:
+                            return True
+
+        # Small or thin text that MSER misses still forms horizontal gradient runs
+        if self._has_text_line(gray):
+            return True
+
+        self.frames_skipped += 1
+        return False
+
+    def _is_character_like(self, points):
+        """Geometric and stroke-width checks on a single MSER region"""
+        x, y, w, h = cv2.boundingRect(points)
+        if h < 4 or w < 2:
+            return False
+        aspect = w / h
+        if aspect > 3.0 or aspect < 0.1:
+            return False
+        extent = len(points) / (w * h)
+        if extent < 0.1 or extent > 0.95:
+            return False
+
+        # Characters have strokes of roughly constant width
+        mask = np.zeros((h + 2, w + 2), dtype=np.uint8)
+        mask[points[:, 1] - y + 1, points[:, 0] - x + 1] = 255
+        distances = cv2.distanceTransform(mask, cv2.DIST_L2, 3)
+        strokes = distances[distances > 0]
+        if strokes.size == 0:
+            return False
+        return strokes.std() / strokes.mean() < 0.8
+
+    def _has_text_line(self, gray):
+        """Look for high-contrast, wider-than-tall gradient blobs shaped like text lines"""
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, kernel)
+        _, binary = cv2.threshold(gradient, self.min_contrast, 255, cv2.THRESH_BINARY)
+        binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE,
+                                  cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1)))
+
+        _, _, components, _ = cv2.connectedComponentsWithStats(binary)
+        max_height = gray.shape[0] * 0.2
+        for x, y, w, h, area in components[1:]:
+            if 4 <= h <= max_height and w >= 2 * h and area / (w * h) > 0.3:
+                return True
+        return False
+
+    def stats(self):
+        """
+        Get skip statistics
+
+        Returns:
+            Dict with frames_checked, frames_skipped and skip_ratio
+        """
+        return {
+            'frames_checked': self.frames_checked,
+            'frames_skipped': self.frames_skipped,
+            'skip_ratio': self.frames_skipped / self.frames_checked if self.frames_checked else 0.0
+        }
+
+    def reset(self):
+        """Reset skip statistics"""
+        self.frames_checked = 0
+        self.frames_skipped = 0
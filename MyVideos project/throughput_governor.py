@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Throughput Governor
+Adjusts OCR sampling, detection downscale and batch size during process_video
+to hold a target realtime factor
+"""
+
+import math
+
+
+def parse_speed(value):
+    """Parse a realtime factor such as '2x', '0.5x' or '3'"""
+    speed = float(str(value).strip().lower().rstrip('x'))
+    if speed <= 0:
+        raise ValueError(f"Target speed must be positive: {value}")
+    return speed
+
+
+class ThroughputGovernor:
+    def __init__(self, target_speed, fps, sample_rate=1, max_sample_gap=None,
+                 min_scale=0.5, max_batch_size=16, update_every=None):
+        """
+        Initialize the governor
+
+        Args:
+            target_speed: Desired realtime factor (2.0 = process 1 minute of video in 30 seconds)
+            fps: Video frame rate
+            sample_rate: Smallest (preferred) OCR interval in frames
+            max_sample_gap: Largest OCR interval in frames (default: 1 second of video)
+            min_scale: Smallest detection downscale factor
+            max_batch_size: Largest recognizer batch size, for backends that support batching
+            update_every: Frames between adjustments (default: 1 second of video)
+        """
+        self.target_speed = target_speed
+        self.fps = fps
+        self.min_interval = max(1, sample_rate)
+        self.max_interval = max(self.min_interval, max_sample_gap or int(math.ceil(fps)))
+        self.min_scale = min_scale
+        self.max_batch_size = max_batch_size
+        self.update_every = update_every or max(1, int(round(fps)))
+
+        self.interval = self.min_interval
+        self.scale = 1.0
+        self.batch_size = None  # set by the caller if the backend supports batching
+
+        self.frame_budget = 1.0 / (fps * target_speed)
+        self.ocr_cost = None    # seconds per OCR call (moving average)
+        self.frame_cost = None  # seconds per frame excluding OCR (moving average)
+        self.decisions = []
+        # (previous batch size, predicted speed) while testing a larger batch
+        self._batch_trial = None
+        self._frames = 0
+        self._elapsed = 0.0
+
+    @staticmethod
+    def _average(current, sample, weight=0.2):
+        return sample if current is None else current + weight * (sample - current)
+
+    def record_frame(self, elapsed, ocr_elapsed=None):
+        """
+        Record one frame's wall time
+
+        Args:
+            elapsed: Total seconds spent on the frame (decode wait, OCR, blur, write)
+            ocr_elapsed: Seconds of that spent in OCR, if OCR ran on this frame
+        """
+        self._frames += 1
+        self._elapsed += elapsed
+        if ocr_elapsed is not None:
+            self.ocr_cost = self._average(self.ocr_cost, ocr_elapsed)
+            elapsed -= ocr_elapsed
+        self.frame_cost = self._average(self.frame_cost, elapsed)
+
+    def predicted_speed(self):
+        """Realtime factor expected with the current settings"""
+        if self.frame_cost is None:
+            return None
+        per_frame = self.frame_cost + (self.ocr_cost or 0.0) / self.interval
+        return 1.0 / (per_frame * self.fps) if per_frame > 0 else float('inf')
+
+    def achieved_speed(self):
+        """Realtime factor achieved so far"""
+        if not self._elapsed:
+            return None
+        return self._frames / self.fps / self._elapsed
+
+    def update(self, frame_index):
+        """
+        Adjust settings if due (call once per frame)
+
+        Returns:
+            True if any setting changed
+        """
+        if frame_index == 0 or frame_index % self.update_every or self.ocr_cost is None:
+            return False
+
+        speed = self.predicted_speed()
+        before = (self.interval, self.scale, self.batch_size)
+
+        if self._batch_trial is not None:
+            # Keep a larger batch only if it measurably helped; otherwise stop trying
+            previous_batch, previous_speed = self._batch_trial
+            self._batch_trial = None
+            if speed < previous_speed * 1.05:
+                self.batch_size = previous_batch
+                self.max_batch_size = previous_batch
+
+        if speed < self.target_speed:
+            self._speed_up()
+        elif speed > self.target_speed * 1.25:
+            self._slow_down()
+
+        if (self.interval, self.scale, self.batch_size) == before:
+            return False
+
+        decision = {
+            'frame': frame_index,
+            'predicted_speed': round(speed, 2),
+            'interval': self.interval,
+            'scale': round(self.scale, 2),
+            'batch_size': self.batch_size
+        }
+        self.decisions.append(decision)
+        print(f"\n[governor] frame {frame_index}: predicted {speed:.2f}x "
+              f"vs target {self.target_speed:.2f}x "
+              f"-> OCR every {self.interval} frame(s), detection scale {self.scale:.2f}"
+              + (f", batch size {self.batch_size}" if self.batch_size else ""))
+        return True
+
+    def _speed_up(self):
+        """Cheapest accuracy loss first: batch size, then sampling interval, then downscale"""
+        if self.batch_size and self.batch_size < self.max_batch_size:
+            self._batch_trial = (self.batch_size, self.predicted_speed())
+            self.batch_size = min(self.max_batch_size, self.batch_size * 2)
+            return
+
+        ocr_budget = self.frame_budget - self.frame_cost
+        if self.interval < self.max_interval:
+            needed = math.ceil(self.ocr_cost / ocr_budget) if ocr_budget > 0 else self.max_interval
+            self.interval = min(self.max_interval, max(self.interval + 1, needed))
+            return
+
+        if self.scale > self.min_scale:
+            # OCR cost scales roughly with pixel count
+            target_cost = max(ocr_budget, 0.0) * self.interval
+            if self.ocr_cost and target_cost > 0:
+                ratio = math.sqrt(target_cost / self.ocr_cost)
+            else:
+                ratio = 0.0
+            new_scale = max(self.min_scale, min(self.scale * 0.9, self.scale * ratio))
+            self.ocr_cost *= (new_scale / self.scale) ** 2
+            self.scale = new_scale
+
+    def _slow_down(self):
+        """Give accuracy back in reverse order: full resolution first, then denser sampling"""
+        if self.scale < 1.0:
+            new_scale = min(1.0, self.scale / 0.9)
+            self.ocr_cost *= (new_scale / self.scale) ** 2
+            self.scale = new_scale
+        elif self.interval > self.min_interval:
+            self.interval -= 1
+
+    def summary(self):
+        """Governor settings and decisions for the processing stats"""
+        achieved = self.achieved_speed()
+        return {
+            'target_speed': self.target_speed,
+            'achieved_speed': round(achieved, 2) if achieved else None,
+            'final_interval': self.interval,
+            'final_scale': round(self.scale, 2),
+            'decisions': self.decisions
+        }